@@ -3,7 +3,7 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from alembic import context
 from app.database import Base
-from app.models import Event, VisibilityEnum  # Explicit imports
+from app.models import Event, EventDailyCount, SyncState, SyncJob, NotificationOutbox, EventEnrichment, VisibilityEnum  # Explicit imports
 from app.config import settings
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,53 @@
+"""create events table
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+Existing deployments whose events table was created before Alembic was
+introduced must run `alembic stamp 0001` once before `alembic upgrade head`,
+since this revision creates the table.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column(
+            'visibility',
+            sa.Enum('PUBLIC', 'PRIVATE', 'UNIVERSITY_ONLY', name='visibilityenum'),
+            nullable=False,
+        ),
+        sa.Column('location', sa.String(length=200), nullable=True),
+        sa.Column('link', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_events_id', 'events', ['id'], unique=False)
+    op.create_index('ix_events_name', 'events', ['name'], unique=False)
+    op.create_index('ix_events_date', 'events', ['date'], unique=False)
+    op.create_index('ix_events_date_id', 'events', ['date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_date_id', table_name='events')
+    op.drop_index('ix_events_date', table_name='events')
+    op.drop_index('ix_events_name', table_name='events')
+    op.drop_index('ix_events_id', table_name='events')
+    op.drop_table('events')
+    sa.Enum(name='visibilityenum').drop(op.get_bind(), checkfirst=True)
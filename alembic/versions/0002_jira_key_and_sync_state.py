@@ -0,0 +1,55 @@
+"""add jira_key to events and sync_state table
+
+Backfills jira_key from the link of issues imported by earlier syncs and
+deletes the duplicate copies those syncs inserted.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# Earlier syncs stored only the issue link, "<JIRA_BASE_URL>/browse/<KEY>", for
+# issues of the EV project (jira_service.JIRA_PROJECT_KEY)
+BROWSE_KEY_PATTERN = r'/browse/(EV-[0-9]+)$'
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('jira_key', sa.String(length=50), nullable=True))
+    # Recover the key of previously imported issues, or the next incremental sync
+    # inserts every issue again instead of updating it
+    op.execute(
+        sa.text("UPDATE events SET jira_key = substring(link from :pattern) WHERE link ~ :pattern")
+        .bindparams(pattern=BROWSE_KEY_PATTERN)
+    )
+    # Each full sync re-inserted every issue; keep the newest copy of each
+    op.execute(
+        """
+        DELETE FROM events
+        WHERE jira_key IS NOT NULL
+          AND id NOT IN (SELECT max(id) FROM events WHERE jira_key IS NOT NULL GROUP BY jira_key)
+        """
+    )
+    op.create_index('ix_events_jira_key', 'events', ['jira_key'], unique=True)
+    op.create_table(
+        'sync_state',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('watermark', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sync_state')
+    op.drop_index('ix_events_jira_key', table_name='events')
+    op.drop_column('events', 'jira_key')
@@ -0,0 +1,50 @@
+"""composite and partial indexes for event filters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids blocking writes while the indexes build, but cannot
+    # run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_visibility_date_id',
+            'events',
+            ['visibility', 'date', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # Partial index for the public feed; "upcoming" is applied as a range
+        # condition at query time because index predicates cannot use now()
+        op.create_index(
+            'ix_events_public_date_id',
+            'events',
+            ['date', 'id'],
+            unique=False,
+            postgresql_where=sa.text("visibility = 'PUBLIC'"),
+            postgresql_concurrently=True,
+        )
+        # Unused, and ix_events_date is a prefix of ix_events_date_id
+        op.drop_index('ix_events_name', table_name='events', postgresql_concurrently=True)
+        op.drop_index('ix_events_date', table_name='events', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_events_date', 'events', ['date'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_events_name', 'events', ['name'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_events_public_date_id', table_name='events', postgresql_concurrently=True)
+        op.drop_index('ix_events_visibility_date_id', table_name='events', postgresql_concurrently=True)
@@ -0,0 +1,75 @@
+"""full-text search vector over event name and description
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('english', coalesce({row}name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}description, '')), 'B')
+"""
+
+
+def upgrade() -> None:
+    # A STORED generated column would rewrite the whole table under an ACCESS
+    # EXCLUSIVE lock. Instead, add a plain nullable column (a catalog-only
+    # change), keep it current with a trigger, backfill it in short batches and
+    # build the index concurrently.
+    op.add_column('events', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(f"""
+        CREATE FUNCTION events_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER events_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF name, description ON events
+        FOR EACH ROW EXECUTE FUNCTION events_search_vector_update()
+    """)
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        min_id, max_id = bind.execute(sa.text("SELECT min(id), max(id) FROM events")).one()
+        if min_id is not None:
+            # Each batch commits on its own, so row locks are held only briefly
+            for start in range(min_id, max_id + 1, BACKFILL_BATCH_SIZE):
+                bind.execute(
+                    sa.text(
+                        f"UPDATE events SET search_vector = {SEARCH_VECTOR_EXPRESSION.format(row='')} "
+                        "WHERE id >= :start AND id < :stop AND search_vector IS NULL"
+                    ),
+                    {"start": start, "stop": start + BACKFILL_BATCH_SIZE},
+                )
+        op.create_index(
+            'ix_events_search_vector',
+            'events',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_events_search_vector', table_name='events', postgresql_concurrently=True)
+    op.execute("DROP TRIGGER events_search_vector_trigger ON events")
+    op.execute("DROP FUNCTION events_search_vector_update()")
+    op.drop_column('events', 'search_vector')
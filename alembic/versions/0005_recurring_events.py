@@ -0,0 +1,37 @@
+"""recurring events: rrule and recurrence_end
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('rrule', sa.String(length=500), nullable=True))
+    op.add_column('events', sa.Column('recurrence_end', sa.DateTime(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_recurring_date',
+            'events',
+            ['date'],
+            unique=False,
+            postgresql_where=sa.text('rrule IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_events_recurring_date', table_name='events', postgresql_concurrently=True)
+    op.drop_column('events', 'recurrence_end')
+    op.drop_column('events', 'rrule')
@@ -0,0 +1,24 @@
+"""sequence for live event feed message ids
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE event_feed_seq")
+
+
+def downgrade() -> None:
+    op.execute("DROP SEQUENCE event_feed_seq")
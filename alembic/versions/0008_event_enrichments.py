@@ -0,0 +1,99 @@
+"""event description enrichment cache
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+# Whitespace-insensitive, so reformatted copies of the same text share a cache entry
+NORMALIZED_DESCRIPTION = "nullif(btrim(regexp_replace({row}description, '\\s+', ' ', 'g')), '')"
+DESCRIPTION_HASH = f"encode(sha256(convert_to({NORMALIZED_DESCRIPTION}, 'UTF8')), 'hex')"
+
+
+def upgrade() -> None:
+    op.create_table(
+        'event_enrichments',
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('tags', postgresql.JSONB(), nullable=True),
+        sa.Column('model', sa.String(length=100), nullable=True),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('enriched_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('content_hash'),
+    )
+    op.create_index(
+        'ix_event_enrichments_pending',
+        'event_enrichments',
+        ['next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text('enriched_at IS NULL'),
+    )
+    op.add_column('events', sa.Column('description_hash', sa.String(length=64), nullable=True))
+
+    # Every write path (API, bulk import, Jira sync) goes through the trigger,
+    # which also queues each new distinct description exactly once
+    op.execute(f"""
+        CREATE FUNCTION events_description_hash_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.description_hash := {DESCRIPTION_HASH.format(row='NEW.')};
+            IF NEW.description_hash IS NOT NULL THEN
+                INSERT INTO event_enrichments (content_hash, description)
+                VALUES (NEW.description_hash, {NORMALIZED_DESCRIPTION.format(row='NEW.')})
+                ON CONFLICT (content_hash) DO NOTHING;
+            END IF;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER events_description_hash_trigger
+        BEFORE INSERT OR UPDATE OF description ON events
+        FOR EACH ROW EXECUTE FUNCTION events_description_hash_update()
+    """)
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        min_id, max_id = bind.execute(sa.text("SELECT min(id), max(id) FROM events")).one()
+        if min_id is not None:
+            for start in range(min_id, max_id + 1, BACKFILL_BATCH_SIZE):
+                params = {"start": start, "stop": start + BACKFILL_BATCH_SIZE}
+                bind.execute(
+                    sa.text(
+                        f"UPDATE events SET description_hash = {DESCRIPTION_HASH.format(row='')} "
+                        "WHERE id >= :start AND id < :stop AND description IS NOT NULL"
+                    ),
+                    params,
+                )
+                bind.execute(
+                    sa.text(
+                        "INSERT INTO event_enrichments (content_hash, description) "
+                        f"SELECT DISTINCT ON (description_hash) description_hash, {NORMALIZED_DESCRIPTION.format(row='')} "
+                        "FROM events WHERE id >= :start AND id < :stop AND description_hash IS NOT NULL "
+                        "ON CONFLICT (content_hash) DO NOTHING"
+                    ),
+                    params,
+                )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER events_description_hash_trigger ON events")
+    op.execute("DROP FUNCTION events_description_hash_update()")
+    op.drop_column('events', 'description_hash')
+    op.drop_index('ix_event_enrichments_pending', table_name='event_enrichments')
+    op.drop_table('event_enrichments')
@@ -0,0 +1,37 @@
+"""sync jobs
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sync_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.Column('trigger', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_sync_jobs_source_created_at', 'sync_jobs', ['source', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sync_jobs_source_created_at', table_name='sync_jobs')
+    op.drop_table('sync_jobs')
@@ -0,0 +1,83 @@
+"""event statistics rollup
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+# Each statement's transition table is folded into one upsert per (day,
+# visibility), so a 500-row bulk insert touches a handful of rollup rows once
+# instead of incrementing the same hot row 500 times
+DELTA_ROWS = {
+    'insert': "SELECT date::date AS day, visibility, 1 AS n FROM new_rows",
+    'update': (
+        "SELECT date::date AS day, visibility, 1 AS n FROM new_rows "
+        "UNION ALL SELECT date::date, visibility, -1 FROM old_rows"
+    ),
+    'delete': "SELECT date::date AS day, visibility, -1 AS n FROM old_rows",
+}
+
+TRANSITION_TABLES = {
+    'insert': "NEW TABLE AS new_rows",
+    'update': "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    'delete': "OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'event_daily_counts',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column(
+            'visibility',
+            postgresql.ENUM('PUBLIC', 'PRIVATE', 'UNIVERSITY_ONLY', name='visibilityenum', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'visibility'),
+    )
+
+    for operation, delta in DELTA_ROWS.items():
+        op.execute(f"""
+            CREATE FUNCTION event_daily_counts_{operation}() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO event_daily_counts AS counts (day, visibility, count)
+                SELECT day, visibility, sum(n) FROM ({delta}) AS delta
+                GROUP BY day, visibility
+                HAVING sum(n) <> 0
+                ON CONFLICT (day, visibility) DO UPDATE SET count = counts.count + EXCLUDED.count;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER event_daily_counts_{operation}_trigger
+            AFTER {operation.upper()} ON events
+            REFERENCING {TRANSITION_TABLES[operation]}
+            FOR EACH STATEMENT EXECUTE FUNCTION event_daily_counts_{operation}()
+        """)
+
+    # The triggers' lock on events blocks writers until this commits, so the
+    # backfill cannot miss or double-count concurrent inserts
+    op.execute("""
+        INSERT INTO event_daily_counts (day, visibility, count)
+        SELECT date::date, visibility, count(*) FROM events GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    for operation in DELTA_ROWS:
+        op.execute(f"DROP TRIGGER event_daily_counts_{operation}_trigger ON events")
+        op.execute(f"DROP FUNCTION event_daily_counts_{operation}()")
+    op.drop_table('event_daily_counts')
@@ -0,0 +1,147 @@
+"""range-partition events by month
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+# Matches settings.partition_months_ahead; the app keeps the window rolling
+PARTITION_MONTHS_AHEAD = 12
+
+COLUMNS = (
+    "id, name, date, description, visibility, location, link, jira_key, rrule, "
+    "recurrence_end, created_at, updated_at, search_vector, description_hash"
+)
+
+TRIGGERS = (
+    """CREATE TRIGGER events_search_vector_trigger
+       BEFORE INSERT OR UPDATE OF name, description ON events
+       FOR EACH ROW EXECUTE FUNCTION events_search_vector_update()""",
+    """CREATE TRIGGER events_description_hash_trigger
+       BEFORE INSERT OR UPDATE OF description ON events
+       FOR EACH ROW EXECUTE FUNCTION events_description_hash_update()""",
+    """CREATE TRIGGER event_daily_counts_insert_trigger
+       AFTER INSERT ON events REFERENCING NEW TABLE AS new_rows
+       FOR EACH STATEMENT EXECUTE FUNCTION event_daily_counts_insert()""",
+    """CREATE TRIGGER event_daily_counts_update_trigger
+       AFTER UPDATE ON events REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+       FOR EACH STATEMENT EXECUTE FUNCTION event_daily_counts_update()""",
+    """CREATE TRIGGER event_daily_counts_delete_trigger
+       AFTER DELETE ON events REFERENCING OLD TABLE AS old_rows
+       FOR EACH STATEMENT EXECUTE FUNCTION event_daily_counts_delete()""",
+)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def create_events_table(partitioned: bool) -> None:
+    op.create_table(
+        'events',
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('events_id_seq')"), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column(
+            'visibility',
+            postgresql.ENUM('PUBLIC', 'PRIVATE', 'UNIVERSITY_ONLY', name='visibilityenum', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('location', sa.String(length=200), nullable=True),
+        sa.Column('link', sa.String(length=500), nullable=True),
+        sa.Column('jira_key', sa.String(length=50), nullable=True),
+        sa.Column('rrule', sa.String(length=500), nullable=True),
+        sa.Column('recurrence_end', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True),
+        sa.Column('description_hash', sa.String(length=64), nullable=True),
+        # A partitioned table's primary key must include the partition key
+        sa.PrimaryKeyConstraint(*(('id', 'date') if partitioned else ('id',)), name='events_pkey'),
+        **({'postgresql_partition_by': 'RANGE (date)'} if partitioned else {}),
+    )
+    op.execute("ALTER SEQUENCE events_id_seq OWNED BY events.id")
+
+
+def create_events_indexes(jira_key_unique: bool) -> None:
+    op.create_index('ix_events_date_id', 'events', ['date', 'id'])
+    op.create_index('ix_events_visibility_date_id', 'events', ['visibility', 'date', 'id'])
+    op.create_index(
+        'ix_events_public_date_id', 'events', ['date', 'id'],
+        postgresql_where=sa.text("visibility = 'PUBLIC'"),
+    )
+    op.create_index('ix_events_search_vector', 'events', ['search_vector'], postgresql_using='gin')
+    op.create_index(
+        'ix_events_recurring_date', 'events', ['date'],
+        postgresql_where=sa.text('rrule IS NOT NULL'),
+    )
+    op.create_index('ix_events_jira_key', 'events', ['jira_key'], unique=jira_key_unique)
+
+
+def replace_events_table(partitioned: bool) -> str:
+    """Move the current table aside under a new name and create the replacement"""
+    old_name = 'events_unpartitioned' if partitioned else 'events_partitioned'
+    op.execute(f"ALTER TABLE events RENAME TO {old_name}")
+    op.execute(f"ALTER TABLE {old_name} RENAME CONSTRAINT events_pkey TO {old_name}_pkey")
+    for index in ('ix_events_id', 'ix_events_date_id', 'ix_events_visibility_date_id', 'ix_events_public_date_id',
+                  'ix_events_search_vector', 'ix_events_recurring_date', 'ix_events_jira_key'):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+    # Keep the id sequence alive when the old table is dropped
+    op.execute("ALTER SEQUENCE events_id_seq OWNED BY NONE")
+    create_events_table(partitioned)
+    return old_name
+
+
+def upgrade() -> None:
+    # Rewrites the table under an ACCESS EXCLUSIVE lock; run it in a maintenance
+    # window on large installations. Triggers are created after the copy, so the
+    # copied rows are neither re-hashed nor counted twice in the stats rollup.
+    old_name = replace_events_table(partitioned=True)
+
+    bind = op.get_bind()
+    first = bind.execute(sa.text(f"SELECT min(date) FROM {old_name}")).scalar()
+    this_month = date.today().replace(day=1)
+    month = min(first.date().replace(day=1), this_month) if first else this_month
+    last = add_months(this_month, PARTITION_MONTHS_AHEAD)
+    while month <= last:
+        following = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE events_p{month:%Y%m} PARTITION OF events "
+            f"FOR VALUES FROM ('{month}') TO ('{following}')"
+        )
+        month = following
+    # Catches dates beyond the premade window until maintenance creates their month
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+    op.execute("CREATE SCHEMA IF NOT EXISTS events_archive")
+
+    create_events_indexes(jira_key_unique=False)
+    op.execute(f"INSERT INTO events ({COLUMNS}) SELECT {COLUMNS} FROM {old_name}")
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    op.execute(f"DROP TABLE {old_name}")
+    op.execute("ANALYZE events")
+
+
+def downgrade() -> None:
+    # Archived partitions in the events_archive schema are left untouched
+    old_name = replace_events_table(partitioned=False)
+    op.execute(f"INSERT INTO events ({COLUMNS}) SELECT {COLUMNS} FROM {old_name}")
+    create_events_indexes(jira_key_unique=True)
+    op.create_index('ix_events_id', 'events', ['id'])
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    op.execute(f"DROP TABLE {old_name}")
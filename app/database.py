@@ -1,21 +1,188 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from app.config import DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from app.config import settings, DATABASE_URL
+from app.utils.metrics import registry, Gauge, DB_QUERY_DURATION, DB_POOL_CHECKOUT_WAIT
 
-# Convert sync URL to async URL
-async_database_url = DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://')
+# Engine defaults per deployment profile. Dev logs SQL and keeps a small pool;
+# prod sizes the pool for concurrent workers and fails fast when it is exhausted.
+ENGINE_PROFILES = {
+    "dev": {
+        "echo": True,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30.0,
+        "pool_recycle": 300,
+        "statement_cache_size": 100,
+        "command_timeout": 60.0,
+    },
+    "prod": {
+        "echo": False,
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 5.0,
+        "pool_recycle": 1800,
+        "statement_cache_size": 500,
+        "command_timeout": 30.0,
+    },
+}
 
-# Create async engine
-engine = create_async_engine(
-    async_database_url,
-    echo=True,  # Set to False in production
-    pool_pre_ping=True,
-    pool_recycle=300,
-)
+def engine_options(profile: str = None) -> dict:
+    """Resolve engine settings for a profile, applying any explicit db_* overrides"""
+    options = dict(ENGINE_PROFILES[profile or settings.db_profile])
+    overrides = {
+        "echo": settings.db_echo,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "statement_cache_size": settings.db_statement_cache_size,
+        "command_timeout": settings.db_command_timeout,
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return options
+
+def to_async_url(url: str) -> str:
+    # Convert sync URL to async URL
+    return url.replace('postgresql://', 'postgresql+asyncpg://', 1)
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection"""
+    role = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, self.role)
+
+def build_engine(url: str, role: str) -> AsyncEngine:
+    """Create an instrumented async engine for the primary or the replica"""
+    options = engine_options()
+    if settings.db_null_pool:
+        # Nothing outlives a checkout, so connections never cross event loops
+        pool_options = {"poolclass": NullPool}
+    else:
+        pool_options = {
+            # The role lives on the class so it survives pool.recreate() on dispose()
+            "poolclass": type("TimedQueuePool", (TimedQueuePool,), {"role": role}),
+            "pool_size": options["pool_size"],
+            "max_overflow": options["max_overflow"],
+            "pool_timeout": options["pool_timeout"],
+            "pool_recycle": options["pool_recycle"],
+            "pool_pre_ping": True,
+        }
+    async_engine = create_async_engine(
+        to_async_url(url),
+        echo=options["echo"],
+        **pool_options,
+        connect_args={
+            # SQLAlchemy's per-connection cache of asyncpg prepared statements
+            "prepared_statement_cache_size": options["statement_cache_size"],
+            "command_timeout": options["command_timeout"],
+        },
+    )
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+    def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is not None:
+            operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, role, operation)
+
+    return async_engine
+
+# Engines are created on first use (or by the app lifespan), not at import time,
+# so importing models or services stays cheap and opens nothing
+_engines: Dict[str, AsyncEngine] = {}
+
+def get_engine() -> AsyncEngine:
+    if "primary" not in _engines:
+        _engines["primary"] = build_engine(DATABASE_URL, "primary")
+    return _engines["primary"]
+
+def get_read_engine() -> AsyncEngine:
+    """The replica engine, or the primary when no replica is configured"""
+    if not settings.database_replica_url:
+        return get_engine()
+    if "replica" not in _engines:
+        _engines["replica"] = build_engine(settings.database_replica_url, "replica")
+    return _engines["replica"]
+
+def init_engines() -> None:
+    get_engine()
+    get_read_engine()
+
+async def dispose_engines() -> None:
+    for pooled_engine in list(_engines.values()):
+        await pooled_engine.dispose()
+    _engines.clear()
+
+@asynccontextmanager
+async def advisory_lock(name: str) -> AsyncIterator[bool]:
+    """
+    Try to take a session-level Postgres advisory lock, held on a dedicated
+    connection until the block exits. Yields whether it was acquired; only one
+    holder exists across all workers and replicas sharing the primary.
+    """
+    async with get_engine().connect() as conn:
+        acquired = await conn.scalar(text("SELECT pg_try_advisory_lock(hashtext(:name))"), {"name": name})
+        await conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": name})
+                await conn.commit()
+
+def __getattr__(name: str):
+    # Keeps `from app.database import engine` working for scripts and benchmarks
+    if name == "engine":
+        return get_engine()
+    if name == "read_engine":
+        return get_read_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _pool_stats():
+    stats = {}
+    for role, pooled_engine in _engines.items():
+        pool = pooled_engine.sync_engine.pool
+        stats[(role, "size")] = pool.size()
+        stats[(role, "checked_out")] = pool.checkedout()
+        stats[(role, "overflow")] = pool.overflow()
+    return stats
+
+registry.register(Gauge("db_pool_connections", "Database connection pool state", ("role", "state"), _pool_stats))
+
+class LazySessionMaker(async_sessionmaker):
+    """Session factory that binds to its engine when the first session is made"""
+
+    def __init__(self, get_bind, **kw):
+        super().__init__(**kw)
+        self._get_bind = get_bind
+
+    def __call__(self, **local_kw) -> AsyncSession:
+        local_kw.setdefault("bind", self._get_bind())
+        return super().__call__(**local_kw)
 
-# Create session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
+# Create session factories
+AsyncSessionLocal = LazySessionMaker(
+    get_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+ReadSessionLocal = LazySessionMaker(
+    get_read_engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
@@ -30,3 +197,12 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+# Dependency for read-only routes; uses the replica when one is configured.
+# Replicas lag the primary slightly, so never use this to read back a write.
+async def get_read_db():
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -1,44 +1,117 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import events, calendar, jira
-
-app = FastAPI(
-    title="Campus Event Organizer API",
-    description="A FastAPI-based application for organizing and managing events on a university campus",
-    version="0.1.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routes
-app.include_router(events.router, prefix="/events", tags=["Events"])
-app.include_router(calendar.router, prefix="", tags=["Calendar"])
-app.include_router(jira.router, prefix="/jira", tags=["Jira"])
-
-@app.get("/health")
-async def health_check():
-    """Health check endpoint for monitoring"""
-    return {"status": "healthy", "service": "campus-event-organizer"}
-
-@app.get("/")
-async def root():
-    """Root endpoint with API information"""
-    return {
-        "message": "Campus Event Organizer API",
-        "version": "0.1.0",
-        "docs": "/docs",
-        "health": "/health"
-    }
+from fastapi.responses import PlainTextResponse
+from app.config import settings
+from app.database import init_engines, dispose_engines
+from app.routes import events, calendar
+from app.services.enrichment_service import enrichment_worker
+from app.services.idempotency_service import idempotency_store
+from app.services.live_service import broadcaster
+from app.services.notification_service import notification_dispatcher
+from app.services.partition_service import partition_maintainer
+from app.utils.admission import AdmissionMiddleware
+from app.utils.metrics import registry, MetricsMiddleware
 
-if __name__ == "__main__":
+def jira_enabled() -> bool:
+    return bool(settings.jira_url)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown"""
+    init_engines()
+    if jira_enabled():
+        from app.services.jira_service import start_jira_client
+        from app.services.sync_service import jira_sync_scheduler
+
+        await start_jira_client()
+        await jira_sync_scheduler.start()
+    await broadcaster.start()
+    await notification_dispatcher.start()
+    await enrichment_worker.start()
+    await partition_maintainer.start()
+    await idempotency_store.start()
+    yield
+    await idempotency_store.stop()
+    await partition_maintainer.stop()
+    await enrichment_worker.stop()
+    await notification_dispatcher.stop()
+    await broadcaster.stop()
+    if jira_enabled():
+        from app.services.jira_service import close_jira_client
+        from app.services.sync_service import jira_sync_scheduler
+
+        await jira_sync_scheduler.stop()
+        await close_jira_client()
+    await dispose_engines()
+
+def create_app() -> FastAPI:
+    """
+    Build the application. Integrations are wired in only when configured, so
+    an instance without Jira credentials never imports the Jira client code.
+    """
+    app = FastAPI(
+        title="Campus Event Organizer API",
+        description="A FastAPI-based application for organizing and managing events on a university campus",
+        version="0.1.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan
+    )
+
+    # Innermost, so shed requests still get CORS headers and show up in metrics
+    app.add_middleware(AdmissionMiddleware)
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Configure appropriately for production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(MetricsMiddleware)
+
+    # Include routes
+    app.include_router(events.router, prefix="/events", tags=["Events"])
+    app.include_router(calendar.router, prefix="", tags=["Calendar"])
+    if jira_enabled():
+        from app.routes import jira
+
+        app.include_router(jira.router, prefix="/jira", tags=["Jira"])
+
+    @app.get("/health")
+    async def health_check():
+        """Health check endpoint for monitoring"""
+        return {"status": "healthy", "service": "campus-event-organizer"}
+
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics in the text exposition format"""
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+    @app.get("/")
+    async def root():
+        """Root endpoint with API information"""
+        return {
+            "message": "Campus Event Organizer API",
+            "version": "0.1.0",
+            "docs": "/docs",
+            "health": "/health"
+        }
+
+    return app
+
+def __getattr__(name: str):
+    # `app` is built on first access, for `from app.main import app` and the
+    # legacy `uvicorn app.main:app`; importing the module for the factory does not
+    if name == "app":
+        globals()["app"] = application = create_app()
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def main():
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run("app.main:create_app", factory=True, host="0.0.0.0", port=8000)
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,167 @@
-from pydantic import BaseModel, Field
-from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum as SQLEnum
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+from typing import List, Optional
+from sqlalchemy import Column, BigInteger, Integer, String, Date, DateTime, Text, Index, Enum as SQLEnum, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.database import Base
-from datetime import datetime
+from app.utils.recurrence import check_occurrence_limit, normalize_rrule, parse_rrule, to_naive_utc
+from datetime import date, datetime
 from enum import Enum
 
+# Text search configuration used by the search_vector trigger and by queries
+SEARCH_CONFIG = "english"
+
 class VisibilityEnum(str, Enum):
     PUBLIC = "public"
     PRIVATE = "private"
     UNIVERSITY_ONLY = "university-only"
 
+def parse_visibility(value: str) -> VisibilityEnum:
+    """Visibility by value ("university-only") or stored name, raising ValueError if unknown"""
+    if value in VisibilityEnum.__members__:
+        return VisibilityEnum[value]
+    try:
+        return VisibilityEnum(value)
+    except ValueError:
+        raise ValueError(f"Invalid visibility: {value}")
+
 class Event(Base):
     __tablename__ = "events"
     
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(200), nullable=False, index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    # Composite primary keys do not autoincrement by default; id still comes from events_id_seq
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(200), nullable=False)
+    # Partition key; the table is range-partitioned by month (see migration 0011)
+    date = Column(DateTime, primary_key=True, nullable=False)
     description = Column(Text, nullable=True)
     visibility = Column(SQLEnum(VisibilityEnum), default=VisibilityEnum.PUBLIC, nullable=False)
     location = Column(String(200), nullable=True)
     link = Column(String(500), nullable=True)
+    # Not unique: a partitioned table can only enforce uniqueness together with date
+    jira_key = Column(String(50), nullable=True, index=True)
+    # RFC 5545 RRULE body (e.g. "FREQ=WEEKLY;BYDAY=TU;COUNT=12") for recurring events;
+    # recurrence_end is the last occurrence, or NULL if the series never ends
+    rrule = Column(String(500), nullable=True)
+    recurrence_end = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    # Weighted name + description vector, maintained by a trigger (see migration 0004)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+    # SHA-256 of the normalized description, maintained by a trigger (see migration 0008)
+    description_hash = deferred(Column(String(64), nullable=True))
+    
+    __table_args__ = (
+        # Keyset pagination walks (date, id) in order
+        Index("ix_events_date_id", "date", "id"),
+        # Listings filtered by visibility and a date range
+        Index("ix_events_visibility_date_id", "visibility", "date", "id"),
+        # The public ICS feed and upcoming public listings
+        Index(
+            "ix_events_public_date_id",
+            "date",
+            "id",
+            postgresql_where=text("visibility = 'PUBLIC'"),
+        ),
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+        # Recurring series are few; listings scan them separately
+        Index("ix_events_recurring_date", "date", postgresql_where=text("rrule IS NOT NULL")),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+    # Rows are identified by id alone; date is only in the table's key for partitioning
+    __mapper_args__ = {"primary_key": [id]}
+
+class EventDailyCount(Base):
+    """Events per day and visibility, kept current by statement-level triggers (see migration 0010)"""
+    __tablename__ = "event_daily_counts"
+    
+    day = Column(Date, primary_key=True)
+    visibility = Column(SQLEnum(VisibilityEnum), primary_key=True)
+    count = Column(BigInteger, default=0, nullable=False)
+
+class SyncState(Base):
+    """High-water marks for incremental syncs from external sources"""
+    __tablename__ = "sync_state"
+    
+    name = Column(String(100), primary_key=True)
+    watermark = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+class SyncJob(Base):
+    """One run (or skipped attempt) of an external sync, shared by all workers"""
+    __tablename__ = "sync_jobs"
+    
+    id = Column(String(32), primary_key=True)
+    source = Column(String(50), nullable=False)
+    trigger = Column(String(20), nullable=False)  # "manual" or "scheduled"
+    status = Column(String(20), nullable=False)  # queued, running, succeeded, failed or skipped
+    message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index("ix_sync_jobs_source_created_at", "source", "created_at"),
+    )
+
+class IdempotencyKey(Base):
+    """Stored response for a client-supplied Idempotency-Key, replayed on retries until it expires"""
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # sha256 of the validated request body
+    response = Column(JSONB, nullable=True)  # NULL only inside the claiming transaction
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+class NotificationOutbox(Base):
+    """Durable spool of outbound notifications, written in the same transaction as the event"""
+    __tablename__ = "notification_outbox"
+    
+    id = Column(BigInteger, primary_key=True)
+    channel = Column(String(50), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    status = Column(String(20), default="pending", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index(
+            "ix_notification_outbox_due",
+            "channel",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+class EventEnrichment(Base):
+    """LLM summary and tags, cached per distinct normalized description"""
+    __tablename__ = "event_enrichments"
+    
+    content_hash = Column(String(64), primary_key=True)
+    description = Column(Text, nullable=False)
+    summary = Column(Text, nullable=True)
+    tags = Column(JSONB, nullable=True)
+    model = Column(String(100), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=func.now(), nullable=False)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    enriched_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index(
+            "ix_event_enrichments_pending",
+            "next_attempt_at",
+            postgresql_where=text("enriched_at IS NULL"),
+        ),
+    )
 
 class EventCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=200)
@@ -31,6 +170,20 @@ class EventCreate(BaseModel):
     visibility: VisibilityEnum = Field(default=VisibilityEnum.PUBLIC)
     location: Optional[str] = Field(None, max_length=200)
     link: Optional[str] = Field(None)
+    rrule: Optional[str] = Field(None, max_length=500)
+    
+    @field_validator('rrule')
+    @classmethod
+    def validate_rrule(cls, v, info: ValidationInfo):
+        if v is None:
+            return v
+        # The occurrence limit depends on where the series starts
+        dtstart = to_naive_utc(info.data.get("date")) or datetime(2000, 1, 1)
+        try:
+            check_occurrence_limit(parse_rrule(v, dtstart))
+        except (ValueError, TypeError, KeyError) as exc:
+            raise ValueError(f'Invalid RRULE: {exc}')
+        return normalize_rrule(v)
 
 class EventResponse(BaseModel):
     id: int
@@ -40,8 +193,37 @@ class EventResponse(BaseModel):
     visibility: VisibilityEnum
     location: Optional[str]
     link: Optional[str]
+    jira_key: Optional[str] = None
+    rrule: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class EventSearchResult(EventResponse):
+    rank: float
+
+class EventStatsBucket(BaseModel):
+    bucket: date
+    visibility: VisibilityEnum
+    count: int
+
+class SyncJobResponse(BaseModel):
+    id: str
+    source: str
+    trigger: str
+    status: str
+    message: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class EventEnrichmentResponse(BaseModel):
+    event_id: int
+    status: str  # "ready", "pending" or "none" (no description)
+    summary: Optional[str] = None
+    tags: List[str] = []
@@ -1,36 +1,38 @@
-from fastapi import APIRouter, Depends, Response
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.services.event_service import get_events_service
-from app.database import get_db
-import datetime
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import StreamingResponse
+from email.utils import format_datetime, parsedate_to_datetime
+from app.config import settings
+from app.services.calendar_service import ics_cache, stream_ics, IcsSnapshot
 
 router = APIRouter()
 
-# ICS File Generator
-async def generate_ics(db: AsyncSession):
-    events = await get_events_service(db, None, None, "public")  # Fetch only public events
-    ics_content = "BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//Campus Events//EN\n"
+def is_not_modified(request: Request, snapshot: IcsSnapshot) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in etags or snapshot.etag in etags or f"W/{snapshot.etag}" in etags
 
-    for event in events:
-        event_date = event.date.strftime("%Y%m%dT%H%M%SZ")  # Convert datetime to ICS format
-        end_date = event.date + datetime.timedelta(hours=1)  # Default to 1-hour event
-
-        ics_content += f"""BEGIN:VEVENT
-SUMMARY:{event.name}
-DTSTART:{event_date}
-DTEND:{end_date.strftime("%Y%m%dT%H%M%SZ")}
-DESCRIPTION:{event.description or ""}
-LOCATION:{event.location or ""}
-URL:{event.link or ""}
-STATUS:CONFIRMED
-END:VEVENT
-"""
-
-    ics_content += "END:VCALENDAR"
-    return ics_content
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return snapshot.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
 
 # FastAPI Route to Serve ICS File
 @router.get("/calendar.ics", response_class=Response)
-async def serve_ics(db: AsyncSession = Depends(get_db)):
-    ics_content = await generate_ics(db)
-    return Response(content=ics_content, media_type="text/calendar")
+async def serve_ics(request: Request):
+    if settings.ics_cache_ttl_seconds <= 0:
+        return StreamingResponse(stream_ics(), media_type="text/calendar")
+
+    snapshot = await ics_cache.get()
+    headers = {
+        "ETag": snapshot.etag,
+        "Last-Modified": format_datetime(snapshot.last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if is_not_modified(request, snapshot):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="text/calendar", headers=headers)
@@ -1,24 +1,209 @@
-from fastapi import APIRouter, Query, Depends
+import json
+from fastapi import APIRouter, Query, Depends, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import Any, AsyncIterator, Optional, List
 from datetime import datetime
-from app.models import EventCreate, EventResponse
-from app.services.event_service import create_event_service, get_events_service
-from app.database import get_db
+from app.config import settings
+from app.models import EventCreate, EventResponse, EventSearchResult, EventEnrichmentResponse, EventStatsBucket
+from app.services.event_service import (
+    create_event_service,
+    bulk_create_events_service,
+    get_events_page_json_service,
+    parse_fields,
+    search_events_service,
+    events_cache,
+)
+from app.services.enrichment_service import get_event_enrichment_service
+from app.services.idempotency_service import (
+    idempotency_store,
+    request_fingerprint,
+    IdempotencyKeyMismatch,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+)
+from app.services.export_service import stream_export, build_export_query, EXPORT_FORMATS
+from app.services.live_service import broadcaster, stream_events
+from app.services.stats_service import get_event_stats_service, STATS_BUCKETS
+from app.database import get_db, get_read_db
+from app.utils.helpers import accepts_encoding
 
 router = APIRouter()
 
-# Create an event
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-seq")
+
+# Create an event; a repeated Idempotency-Key replays the first response
 @router.post("/", response_model=dict)
-async def create_event(event: EventCreate, db: AsyncSession = Depends(get_db)):
-    return await create_event_service(event, db)
+async def create_event(
+    event: EventCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, max_length=IDEMPOTENCY_KEY_MAX_LENGTH)
+):
+    if not idempotency_key:
+        return await create_event_service(event, db)
+    try:
+        body, replayed = await idempotency_store.run(
+            db,
+            idempotency_key,
+            request_fingerprint(event.model_dump_json()),
+            lambda record: create_event_service(event, db, before_commit=record),
+        )
+    except IdempotencyKeyMismatch as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return body
+
+async def iter_ndjson(request: Request) -> AsyncIterator[Any]:
+    """Parse an NDJSON body incrementally, yielding a ValueError for malformed lines"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as exc:
+                    yield ValueError(f"Invalid JSON line: {exc}")
+    if buffer.strip():
+        try:
+            yield json.loads(buffer)
+        except ValueError as exc:
+            yield ValueError(f"Invalid JSON line: {exc}")
+
+async def iter_json_array(items: List[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+# Create many events from a JSON array or an NDJSON stream of EventCreate items
+@router.post("/bulk", response_model=dict)
+async def create_events_bulk(request: Request, db: AsyncSession = Depends(get_db)):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_MEDIA_TYPES:
+        items = iter_ndjson(request)
+    else:
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+        items = iter_json_array(payload)
+    
+    return await bulk_create_events_service(items, db)
 
-# Get events with filtering
+# Get events with filtering, one keyset page at a time.
+# The cursor for the next page is returned in the X-Next-Cursor header.
+# fields=id,name,date returns (and reads) only those columns.
 @router.get("/", response_model=List[EventResponse])
 async def get_events(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    visibility: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=settings.events_max_page_size),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of the event fields")
+):
+    try:
+        body, next_cursor = await get_events_page_json_service(
+            db, limit or settings.events_page_size, cursor, start_time, end_time, visibility,
+            parse_fields(fields)
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    
+    # The body is already validated and serialized, so skip response_model encoding
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Full-text search over name and description, ranked by relevance.
+# Supports the same filters and cursor pagination as the listing.
+@router.get("/search", response_model=List[EventSearchResult])
+async def search_events(
+    q: str = Query(..., min_length=1, max_length=200),
+    db: AsyncSession = Depends(get_read_db),
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    visibility: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=settings.events_max_page_size),
+    cursor: Optional[str] = Query(None)
+):
+    try:
+        body, next_cursor = await search_events_service(
+            db, q, limit or settings.events_page_size, cursor, start_time, end_time, visibility
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Stream every matching event as NDJSON or CSV via COPY, gzipped when the client accepts it
+@router.get("/export")
+async def export_events(
+    request: Request,
+    format: str = Query("ndjson", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
     start_time: Optional[datetime] = Query(None),
     end_time: Optional[datetime] = Query(None),
     visibility: Optional[str] = Query(None)
 ):
-    return await get_events_service(db, start_time, end_time, visibility)
+    try:
+        build_export_query(format, start_time, end_time, visibility)  # Validate before streaming
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    
+    gzip = accepts_encoding(request.headers.get("accept-encoding"), "gzip")
+    headers = {
+        "Content-Disposition": f'attachment; filename="events.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_export(format, start_time, end_time, visibility, gzip),
+        media_type=EXPORT_FORMATS[format],
+        headers=headers,
+    )
+
+# Event counts per day, week or month and visibility, served from a rollup table
+@router.get("/stats", response_model=List[EventStatsBucket])
+async def get_event_stats(
+    bucket: str = Query("day", pattern=f"^({'|'.join(STATS_BUCKETS)})$"),
+    visibility: Optional[str] = Query(None),
+    start_time: Optional[datetime] = Query(None),
+    end_time: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        return await get_event_stats_service(db, bucket, visibility, start_time, end_time)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+# Live feed of event changes as Server-Sent Events.
+# Reconnecting clients send Last-Event-ID to resume without refetching.
+@router.get("/stream")
+async def stream_event_changes(
+    visibility: Optional[str] = Query(None),
+    last_event_id: Optional[str] = Header(None)
+):
+    subscriber, replay = broadcaster.subscribe(visibility, last_event_id)
+    return StreamingResponse(
+        stream_events(subscriber, replay),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# LLM summary and tags for an event's description, filled in asynchronously after insert
+@router.get("/{event_id}/enrichment", response_model=EventEnrichmentResponse)
+async def get_event_enrichment(event_id: int, db: AsyncSession = Depends(get_read_db)):
+    enrichment = await get_event_enrichment_service(event_id, db)
+    if enrichment is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return enrichment
+
+# Listing cache counters
+@router.get("/cache/stats", response_model=dict)
+async def get_events_cache_stats():
+    return events_cache.stats()
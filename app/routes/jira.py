@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.services.jira_service import sync_jira_events, fetch_jira_page, test_jira_connection
-from app.database import get_db
-from app.models import Event
+from app.services.jira_service import fetch_jira_page, test_jira_connection
+from app.services.sync_service import jira_sync_scheduler, get_sync_job_service
+from app.database import get_db, get_read_db
+from app.models import Event, SyncJobResponse
 
 router = APIRouter()
 
@@ -17,16 +18,23 @@ async def test_jira():
 async def fetch_jira():
     return await fetch_jira_page()
 
-# API to sync events from Jira
-@router.post("/sync")
-async def sync_events(db: AsyncSession = Depends(get_db)):
-    return await sync_jira_events(db)
+# API to sync events from Jira; runs in the background and returns a job to poll
+@router.post("/sync", response_model=SyncJobResponse, status_code=202)
+async def sync_events():
+    return await jira_sync_scheduler.trigger()
+
+# API to check on a sync job; reads the primary, since the job was just written
+@router.get("/sync/{job_id}", response_model=SyncJobResponse)
+async def get_sync_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    job = await get_sync_job_service(job_id, db)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job
 
 # API to view Jira-imported events
 @router.get("/jira-events")
-async def get_jira_events(db: AsyncSession = Depends(get_db)):
-    # Note: This would need to be updated when you add jira_id field to Event model
-    query = select(Event)
+async def get_jira_events(db: AsyncSession = Depends(get_read_db)):
+    query = select(Event).where(Event.jira_key.isnot(None)).order_by(Event.date, Event.id)
     result = await db.execute(query)
     events = result.scalars().all()
     return events
\ No newline at end of file
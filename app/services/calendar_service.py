@@ -0,0 +1,150 @@
+import asyncio
+import datetime
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from app.models import Event, VisibilityEnum
+from app.database import ReadSessionLocal
+from app.config import settings
+
+ICS_HEADER = "BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//Campus Events//EN\n"
+ICS_FOOTER = "END:VCALENDAR"
+
+# Rows pulled from the server-side cursor per round trip, and VEVENTs per chunk sent
+ICS_FETCH_SIZE = 500
+ICS_EVENTS_PER_CHUNK = 100
+
+PUBLIC_FEED = "public"
+
+def format_vevent(event) -> str:
+    event_date = event.date.strftime("%Y%m%dT%H%M%SZ")  # Convert datetime to ICS format
+    end_date = event.date + datetime.timedelta(hours=1)  # Default to 1-hour event
+
+    # A recurring series is one VEVENT; calendar clients expand the RRULE themselves
+    rrule = f"RRULE:{event.rrule}\n" if event.rrule else ""
+
+    return f"""BEGIN:VEVENT
+SUMMARY:{event.name}
+DTSTART:{event_date}
+DTEND:{end_date.strftime("%Y%m%dT%H%M%SZ")}
+{rrule}DESCRIPTION:{event.description or ""}
+LOCATION:{event.location or ""}
+URL:{event.link or ""}
+STATUS:CONFIRMED
+END:VEVENT
+"""
+
+def build_ics_query():
+    return (
+        select(Event.name, Event.date, Event.description, Event.location, Event.link, Event.rrule)
+        .where(Event.visibility == VisibilityEnum.PUBLIC)  # Fetch only public events
+        .order_by(Event.date, Event.id)
+    )
+
+# ICS File Generator
+async def iter_ics(db: AsyncSession) -> AsyncIterator[str]:
+    """
+    Yield the public calendar in chunks, reading events through a server-side
+    cursor so memory use does not grow with the number of events.
+    """
+    query = build_ics_query().execution_options(yield_per=ICS_FETCH_SIZE)
+
+    yield ICS_HEADER
+    result = await db.stream(query)
+    async for rows in result.partitions(ICS_EVENTS_PER_CHUNK):
+        yield "".join(format_vevent(row) for row in rows)
+    yield ICS_FOOTER
+
+async def generate_ics(db: AsyncSession) -> str:
+    """Render the whole public calendar into a single string"""
+    return "".join([chunk async for chunk in iter_ics(db)])
+
+async def feed_last_modified(db: AsyncSession) -> datetime.datetime:
+    """
+    When the events table last changed, from the data itself, so every worker
+    and replica reports the same Last-Modified for the same content.
+    
+    Taken over all events, not only public ones, so an event leaving the feed
+    (its visibility changed) still moves it forward.
+    """
+    latest = await db.scalar(select(func.max(Event.updated_at)))
+    if latest is None:
+        return datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    # updated_at is naive UTC; HTTP dates have one-second resolution
+    return latest.replace(tzinfo=datetime.timezone.utc, microsecond=0)
+
+async def stream_ics() -> AsyncIterator[str]:
+    # The session is owned by the generator so it stays open until the last chunk is sent
+    async with ReadSessionLocal() as db:
+        async for chunk in iter_ics(db):
+            yield chunk
+
+@dataclass(frozen=True)
+class IcsSnapshot:
+    body: bytes
+    etag: str
+    last_modified: datetime.datetime
+    generation: int
+    created_at: float
+
+class IcsSnapshotCache:
+    """
+    Keeps one rendered ICS body per feed.
+    
+    Writes call invalidate(), which bumps a generation counter so snapshots
+    rendered before the write are never served again. The TTL bounds staleness
+    for writes made by other worker processes, which this cache cannot see, and
+    for replica lag when the feed is read from a replica.
+    """
+    
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._snapshots: Dict[str, IcsSnapshot] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._generation = 0
+    
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._snapshots.clear()
+    
+    def _fresh(self, feed: str) -> Optional[IcsSnapshot]:
+        snapshot = self._snapshots.get(feed)
+        if snapshot is None or snapshot.generation != self._generation:
+            return None
+        if time.monotonic() - snapshot.created_at > self.ttl_seconds:
+            return None
+        return snapshot
+    
+    async def get(self, feed: str = PUBLIC_FEED) -> IcsSnapshot:
+        snapshot = self._fresh(feed)
+        if snapshot is not None:
+            return snapshot
+        
+        # Only one coroutine per feed renders; the rest wait and reuse its result
+        lock = self._locks.setdefault(feed, asyncio.Lock())
+        async with lock:
+            snapshot = self._fresh(feed)
+            if snapshot is not None:
+                return snapshot
+            
+            generation = self._generation
+            async with ReadSessionLocal() as db:
+                body = (await generate_ics(db)).encode("utf-8")
+                # Read after rendering, so a concurrent write can only make it newer than the body
+                last_modified = await feed_last_modified(db)
+            
+            snapshot = IcsSnapshot(
+                body=body,
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                last_modified=last_modified,
+                generation=generation,
+                created_at=time.monotonic(),
+            )
+            if generation == self._generation:
+                self._snapshots[feed] = snapshot
+            return snapshot
+
+ics_cache = IcsSnapshotCache(settings.ics_cache_ttl_seconds)
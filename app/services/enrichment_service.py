@@ -0,0 +1,358 @@
+import asyncio
+import json
+import re
+import time
+from collections import Counter as TermCounter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Protocol
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Event, EventEnrichment
+from app.utils.logging import logger
+from app.utils.metrics import registry, Counter
+
+ENRICHMENT_LEASE_SECONDS = 300
+SUMMARY_MAX_CHARS = 280
+MAX_TAGS = 5
+
+ENRICHMENT_CALLS = registry.register(Counter(
+    "enrichment_model_calls_total", "LLM calls made to enrich event descriptions", ("outcome",),
+))
+ENRICHED_DESCRIPTIONS = registry.register(Counter(
+    "enrichment_descriptions_total", "Distinct descriptions enriched",
+))
+
+SYSTEM_PROMPT = (
+    "You summarize university campus event descriptions. For each numbered description, "
+    f"write a one-sentence summary of at most {SUMMARY_MAX_CHARS} characters and up to "
+    f"{MAX_TAGS} short lowercase topic tags. Reply with JSON of the form "
+    '{"results": [{"index": 0, "summary": "...", "tags": ["..."]}]} '
+    "with exactly one result per description."
+)
+
+@dataclass
+class Enrichment:
+    summary: str
+    tags: List[str]
+
+@dataclass
+class PendingDescription:
+    content_hash: str
+    description: str
+    attempts: int
+
+class EnrichmentError(Exception):
+    pass
+
+class EnrichmentClient(Protocol):
+    """Turns a batch of descriptions into one Enrichment each, in the same order"""
+
+    model: str
+
+    async def enrich(self, descriptions: List[str]) -> List[Enrichment]: ...
+
+def normalize_description(description: Optional[str]) -> Optional[str]:
+    """Collapse whitespace; mirrors the trigger in migration 0008"""
+    if description is None:
+        return None
+    return " ".join(description.split()) or None
+
+def parse_enrichments(content: str, expected: int) -> List[Enrichment]:
+    """Validate a model reply against the batch it answers"""
+    try:
+        results = json.loads(content)["results"]
+        by_index = {int(item["index"]): item for item in results}
+        return [
+            Enrichment(
+                summary=str(by_index[index]["summary"])[:SUMMARY_MAX_CHARS],
+                tags=[str(tag).lower() for tag in by_index[index].get("tags", [])][:MAX_TAGS],
+            )
+            for index in range(expected)
+        ]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise EnrichmentError(f"Malformed model reply: {exc}")
+
+class OpenAIEnrichmentClient:
+    """Batches descriptions into a single chat completion with a JSON reply"""
+
+    def __init__(self, api_key: str, model: str):
+        self.model = model
+        self._api_key = api_key
+        self._client = None
+
+    def _get_client(self):
+        # The SDK is imported on the first call, so it never slows down startup
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=self._api_key)
+        return self._client
+
+    async def enrich(self, descriptions: List[str]) -> List[Enrichment]:
+        numbered = "\n\n".join(f"[{index}] {description}" for index, description in enumerate(descriptions))
+        try:
+            response = await self._get_client().chat.completions.create(
+                model=self.model,
+                response_format={"type": "json_object"},
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": numbered},
+                ],
+            )
+        except Exception as exc:
+            raise EnrichmentError(f"Model call failed: {exc}")
+        return parse_enrichments(response.choices[0].message.content or "", len(descriptions))
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+class FakeEnrichmentClient:
+    """Deterministic local stand-in for tests and benchmarks"""
+
+    model = "fake"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: List[List[str]] = []
+
+    async def enrich(self, descriptions: List[str]) -> List[Enrichment]:
+        self.calls.append(list(descriptions))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [self._enrich_one(description) for description in descriptions]
+
+    @staticmethod
+    def _enrich_one(description: str) -> Enrichment:
+        summary = re.split(r"(?<=[.!?])\s", description, maxsplit=1)[0][:SUMMARY_MAX_CHARS]
+        words = TermCounter(word for word in re.findall(r"[a-z]{4,}", description.lower()))
+        return Enrichment(summary=summary, tags=[word for word, _ in words.most_common(MAX_TAGS)])
+
+    async def close(self) -> None:
+        pass
+
+class EnrichmentStore(Protocol):
+    """Cache of enrichments keyed by description hash, doubling as the work queue"""
+
+    async def claim(self, limit: int) -> List[PendingDescription]: ...
+
+    async def save(self, items: List[PendingDescription], enrichments: List[Enrichment], model: str) -> None: ...
+
+    async def retry(self, items: List[PendingDescription]) -> None: ...
+
+class PostgresEnrichmentStore:
+    """
+    The event_enrichments table.
+    
+    The events trigger inserts one pending row per new distinct description, so
+    a re-imported or duplicated description never queues a second model call.
+    Claiming takes a lease with FOR UPDATE SKIP LOCKED, so concurrent workers
+    split the backlog instead of repeating it.
+    """
+
+    async def claim(self, limit: int) -> List[PendingDescription]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text("""
+                    UPDATE event_enrichments
+                    SET next_attempt_at = now() + make_interval(secs => :lease),
+                        attempts = attempts + 1
+                    WHERE content_hash IN (
+                        SELECT content_hash FROM event_enrichments
+                        WHERE enriched_at IS NULL AND next_attempt_at <= now() AND attempts < :max_attempts
+                        ORDER BY next_attempt_at
+                        LIMIT :limit
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING content_hash, description, attempts
+                """),
+                {"lease": ENRICHMENT_LEASE_SECONDS, "limit": limit, "max_attempts": settings.enrichment_max_attempts},
+            )
+            items = [PendingDescription(row.content_hash, row.description, row.attempts) for row in result]
+            await db.commit()
+        return items
+
+    async def save(self, items: List[PendingDescription], enrichments: List[Enrichment], model: str) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text("""
+                    UPDATE event_enrichments
+                    SET summary = :summary, tags = CAST(:tags AS jsonb), model = :model, enriched_at = now()
+                    WHERE content_hash = :content_hash
+                """),
+                [
+                    {
+                        "content_hash": item.content_hash,
+                        "summary": enrichment.summary,
+                        "tags": json.dumps(enrichment.tags),
+                        "model": model,
+                    }
+                    for item, enrichment in zip(items, enrichments)
+                ],
+            )
+            await db.commit()
+
+    async def retry(self, items: List[PendingDescription]) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text("""
+                    UPDATE event_enrichments
+                    SET next_attempt_at = now() + make_interval(secs => :base * power(2, attempts - 1))
+                    WHERE content_hash = ANY(:hashes)
+                """),
+                {"hashes": [item.content_hash for item in items], "base": settings.enrichment_retry_base_seconds},
+            )
+            await db.commit()
+
+@dataclass
+class MemoryEnrichmentStore:
+    """Non-durable store for tests and benchmarks"""
+
+    pending: Dict[str, PendingDescription] = field(default_factory=dict)
+    due_at: Dict[str, float] = field(default_factory=dict)
+    enriched: Dict[str, Enrichment] = field(default_factory=dict)
+
+    def add(self, description: str) -> None:
+        normalized = normalize_description(description)
+        if normalized and normalized not in self.pending and normalized not in self.enriched:
+            self.pending[normalized] = PendingDescription(normalized, normalized, 0)
+            self.due_at[normalized] = 0.0
+
+    async def claim(self, limit: int) -> List[PendingDescription]:
+        now = time.monotonic()
+        due = [
+            item for key, item in self.pending.items()
+            if self.due_at[key] <= now and item.attempts < settings.enrichment_max_attempts
+        ][:limit]
+        for item in due:
+            item.attempts += 1
+            self.due_at[item.content_hash] = now + ENRICHMENT_LEASE_SECONDS
+        return due
+
+    async def save(self, items: List[PendingDescription], enrichments: List[Enrichment], model: str) -> None:
+        for item, enrichment in zip(items, enrichments):
+            del self.pending[item.content_hash]
+            self.enriched[item.content_hash] = enrichment
+
+    async def retry(self, items: List[PendingDescription]) -> None:
+        for item in items:
+            self.due_at[item.content_hash] = (
+                time.monotonic() + settings.enrichment_retry_base_seconds * 2 ** (item.attempts - 1)
+            )
+
+class EnrichmentWorker:
+    """
+    Background stage that enriches new descriptions off the request path.
+    
+    Each round claims up to batch_size * max_concurrency pending descriptions,
+    splits them into batches of batch_size, and runs one model call per batch
+    with at most max_concurrency calls in flight. A failed batch is retried
+    later with exponential backoff; the others are unaffected.
+    """
+
+    def __init__(self, store: EnrichmentStore, client: Optional[EnrichmentClient]):
+        self.store = store
+        self.client = client
+        # Created in start(): on Python 3.9 an Event binds to the loop current at construction
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.client is not None
+
+    def wake(self) -> None:
+        if self.enabled and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.client is not None:
+            await self.client.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.enrichment_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.drain()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Description enrichment failed: %s", exc)
+
+    async def _enrich_batch(self, semaphore: asyncio.Semaphore, batch: List[PendingDescription]) -> int:
+        async with semaphore:
+            try:
+                enrichments = await self.client.enrich([item.description for item in batch])
+            except EnrichmentError as exc:
+                ENRICHMENT_CALLS.inc("error")
+                logger.warning("Enrichment batch of %d failed: %s", len(batch), exc)
+                await self.store.retry(batch)
+                return 0
+        ENRICHMENT_CALLS.inc("ok")
+        await self.store.save(batch, enrichments, self.client.model)
+        ENRICHED_DESCRIPTIONS.inc(amount=len(batch))
+        return len(batch)
+
+    async def run_once(self) -> int:
+        """Enrich one round of pending descriptions; returns the number enriched"""
+        batch_size = settings.enrichment_batch_size
+        items = await self.store.claim(batch_size * settings.enrichment_max_concurrency)
+        if not items:
+            return 0
+        semaphore = asyncio.Semaphore(settings.enrichment_max_concurrency)
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        counts = await asyncio.gather(*(self._enrich_batch(semaphore, batch) for batch in batches))
+        return sum(counts)
+
+    async def drain(self) -> int:
+        """Run rounds until nothing is due or a round makes no progress"""
+        total = 0
+        while True:
+            enriched = await self.run_once()
+            if not enriched:
+                return total
+            total += enriched
+
+async def get_event_enrichment_service(event_id: int, db: AsyncSession) -> Optional[dict]:
+    """Cached enrichment for one event, or None if the event does not exist"""
+    row = (await db.execute(
+        select(EventEnrichment.content_hash, EventEnrichment.summary, EventEnrichment.tags, EventEnrichment.enriched_at)
+        .select_from(Event)
+        .outerjoin(EventEnrichment, EventEnrichment.content_hash == Event.description_hash)
+        .where(Event.id == event_id)
+    )).one_or_none()
+    if row is None:
+        return None
+    if row.content_hash is None:
+        return {"event_id": event_id, "status": "none"}
+    if row.enriched_at is None:
+        return {"event_id": event_id, "status": "pending"}
+    return {"event_id": event_id, "status": "ready", "summary": row.summary, "tags": row.tags or []}
+
+def build_worker() -> EnrichmentWorker:
+    client = (
+        OpenAIEnrichmentClient(settings.openai_api_key, settings.enrichment_model)
+        if settings.openai_api_key else None
+    )
+    return EnrichmentWorker(PostgresEnrichmentStore(), client)
+
+enrichment_worker = build_worker()
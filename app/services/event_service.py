@@ -1,47 +1,526 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
-from app.models import Event, EventCreate, EventResponse
-from typing import Optional, List
-from datetime import datetime
-
-async def create_event_service(event_data: EventCreate, db: AsyncSession) -> dict:
-    """Create a new event"""
-    db_event = Event(**event_data.model_dump())
-    db.add(db_event)
-    await db.commit()
-    await db.refresh(db_event)
+from sqlalchemy import select, insert, and_, or_, tuple_, cast, func, literal_column, REAL
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only, selectinload
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, create_model
+from pydantic_core import to_json
+from app.config import settings
+from app.models import Event, EventCreate, EventResponse, SEARCH_CONFIG, parse_visibility
+from app.services.calendar_service import ics_cache
+from app.services.enrichment_service import enrichment_worker
+from app.services.live_service import publish_event_change
+from app.services.notification_service import notification_dispatcher
+from app.utils.helpers import encode_cursor, decode_cursor, encode_rank_cursor, decode_rank_cursor
+from app.utils.metrics import registry, Gauge
+from app.utils.recurrence import merge_occurrences, recurrence_end, to_naive_utc
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Hashable, Optional, List, Tuple, Type
+from collections import OrderedDict
+from functools import lru_cache
+from datetime import datetime, timedelta
+import time
+
+EVENT_LIST_ADAPTER = TypeAdapter(List[EventResponse])
+
+# Table columns backing EventResponse, for reads that bypass the ORM
+EVENT_RESPONSE_COLUMNS = [Event.__table__.c[name] for name in EventResponse.model_fields]
+
+# Always read, whatever fields= asks for: listings are ordered and paginated by
+# (date, id), and recurring series are expanded from their rrule
+LISTING_KEY_FIELDS = ("id", "date", "rrule")
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated fields= value into EventResponse field names, in
+    schema order. Returns None for all fields; raises ValueError on unknown names.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(EventResponse.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in EventResponse.model_fields if name in requested)
+
+def listing_field_names(fields: Optional[Tuple[str, ...]]) -> Tuple[str, ...]:
+    """Requested fields plus the ones a listing needs internally, in schema order"""
+    if fields is None:
+        return tuple(EventResponse.model_fields)
+    needed = set(fields) | set(LISTING_KEY_FIELDS)
+    return tuple(name for name in EventResponse.model_fields if name in needed)
+
+@lru_cache(maxsize=None)
+def event_response_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """EventResponse narrowed to a subset of its fields"""
+    if fields == tuple(EventResponse.model_fields):
+        return EventResponse
+    return create_model(
+        "EventResponse_" + "_".join(fields),
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (EventResponse.model_fields[name].annotation, EventResponse.model_fields[name]) for name in fields},
+    )
+
+class ListingCache:
+    """
+    Bounded LRU cache with a TTL for serialized event listings.
+    
+    invalidate() bumps a generation counter; values computed under an older
+    generation are never stored or served, even if the write raced the read.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
     
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            generation, expires_at, value = entry
+            if generation == self.generation and time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+    
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        if generation != self.generation or self.max_entries <= 0:
+            return
+        self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "generation": self.generation,
+        }
+
+events_cache = ListingCache(settings.events_cache_max_entries, settings.events_cache_ttl_seconds)
+
+registry.register(Gauge(
+    "events_listing_cache",
+    "Event listing cache counters",
+    ("stat",),
+    lambda: {(name,): value for name, value in events_cache.stats().items()},
+))
+
+def invalidate_event_caches() -> None:
+    """Drop every cached view of the events table after a write"""
+    events_cache.invalidate()
+    ics_cache.invalidate()
+
+def event_row(event_data: EventCreate) -> dict:
+    """Column values for a new event, including the derived recurrence_end"""
+    row = event_data.model_dump()
+    row["recurrence_end"] = (
+        recurrence_end(row["rrule"], to_naive_utc(row["date"])) if row["rrule"] else None
+    )
+    return row
+
+def notification_payload(event_id: int, row: dict) -> dict:
+    """JSON-safe summary of a new event for the notification outbox"""
+    visibility = row["visibility"]
     return {
+        "id": event_id,
+        "name": row["name"],
+        "date": row["date"].isoformat(),
+        "visibility": getattr(visibility, "value", visibility),
+    }
+
+async def create_event_service(
+    event_data: EventCreate,
+    db: AsyncSession,
+    before_commit: Optional[Callable[[dict], Awaitable[None]]] = None
+) -> dict:
+    """Create a new event; before_commit receives the response inside the transaction"""
+    row = event_row(event_data)
+    db_event = Event(**row)
+    db.add(db_event)
+    await db.flush()
+    await publish_event_change(db, {
+        "op": "created",
+        "id": db_event.id,
+        "name": db_event.name,
+        "date": db_event.date,
+        "visibility": db_event.visibility,
+    })
+    await notification_dispatcher.enqueue(db, [notification_payload(db_event.id, row)])
+    response = {
         "id": db_event.id,
         "message": "Event created successfully"
     }
+    if before_commit is not None:
+        await before_commit(response)
+    await db.commit()
+    invalidate_event_caches()
+    notification_dispatcher.wake()
+    enrichment_worker.wake()
+    
+    return response
 
-async def get_events_service(
-    db: AsyncSession,
+async def _insert_event_batch(db: AsyncSession, batch: List[Tuple[int, dict]]) -> List[dict]:
+    """Insert validated rows with one multi-row INSERT ... RETURNING, isolating failures"""
+    stmt = insert(Event).returning(Event.id, sort_by_parameter_order=True)
+    try:
+        async with db.begin_nested():
+            result = await db.execute(stmt, [row for _, row in batch])
+            ids = result.scalars().all()
+        return [{"index": index, "id": event_id} for (index, _), event_id in zip(batch, ids)]
+    except SQLAlchemyError:
+        pass
+    
+    # The batch was rejected as a whole; retry row by row to find the offending items
+    results = []
+    for index, row in batch:
+        try:
+            async with db.begin_nested():
+                event_id = (await db.execute(stmt, [row])).scalar_one()
+            results.append({"index": index, "id": event_id})
+        except SQLAlchemyError as exc:
+            results.append({"index": index, "error": str(getattr(exc, "orig", None) or exc)})
+    return results
+
+async def bulk_create_events_service(items: AsyncIterable[Any], db: AsyncSession) -> dict:
+    """
+    Validate and insert events in batches.
+    
+    Each item is reported individually with either its new id or an error, so
+    one bad item never aborts the rest of the import. Each batch is committed
+    on its own to keep transactions short.
+    """
+    batch_size = settings.bulk_insert_batch_size
+    results: List[dict] = []
+    batch: List[Tuple[int, dict]] = []
+    
+    async def flush():
+        if batch:
+            batch_results = await _insert_event_batch(db, batch)
+            results.extend(batch_results)
+            rows = dict(batch)
+            created = [(entry["id"], rows[entry["index"]]) for entry in batch_results if "id" in entry]
+            if created:
+                await publish_event_change(db, {"op": "refresh", "source": "bulk", "count": len(created)})
+                await notification_dispatcher.enqueue(
+                    db, [notification_payload(event_id, row) for event_id, row in created]
+                )
+            await db.commit()
+            batch.clear()
+    
+    index = 0
+    async for item in items:
+        if isinstance(item, Exception):
+            results.append({"index": index, "error": str(item)})
+        else:
+            try:
+                batch.append((index, event_row(EventCreate.model_validate(item))))
+            except ValidationError as exc:
+                results.append({
+                    "index": index,
+                    "error": exc.errors(include_url=False, include_context=False, include_input=False),
+                })
+        index += 1
+        if len(batch) >= batch_size:
+            await flush()
+    await flush()
+    
+    results.sort(key=lambda entry: entry["index"])
+    created = sum(1 for entry in results if "id" in entry)
+    if created:
+        invalidate_event_caches()
+        notification_dispatcher.wake()
+        enrichment_worker.wake()
+    
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": results,
+    }
+
+def event_filters(
     start_time: Optional[datetime] = None,
     end_time: Optional[datetime] = None,
     visibility: Optional[str] = None
-) -> List[EventResponse]:
-    """Get events with optional filtering"""
-    query = select(Event)
-    
-    # Apply filters
+) -> list:
+    """Time range and visibility conditions shared by listings and search; raises ValueError if invalid"""
     conditions = []
     if start_time:
         conditions.append(Event.date >= start_time)
     if end_time:
         conditions.append(Event.date <= end_time)
     if visibility:
-        conditions.append(Event.visibility == visibility)
+        conditions.append(Event.visibility == parse_visibility(visibility))
+    return conditions
+
+def build_events_query(
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    visibility: Optional[str] = None,
+    columns: Optional[list] = None
+):
+    """Build the filtered, (date, id)-ordered events query over Event or the given columns"""
+    query = select(*columns) if columns else select(Event)
     
+    conditions = event_filters(start_time, end_time, visibility)
     if conditions:
         query = query.where(and_(*conditions))
     
-    # Order by date
-    query = query.order_by(Event.date)
+    # Order by date, with id as a tie-breaker so keyset positions are unique
+    return query.order_by(Event.date, Event.id)
+
+def recurrence_window_end(end_time: Optional[datetime]) -> datetime:
+    """Upper bound for expanding recurring series, capped by the configured horizon"""
+    if end_time is not None:
+        return to_naive_utc(end_time)
+    return datetime.utcnow() + timedelta(days=settings.recurrence_horizon_days)
+
+def build_series_query(
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    visibility: Optional[str] = None,
+    columns: Optional[list] = None,
+    after: Optional[Tuple[datetime, int]] = None
+):
+    """Recurring series that can have occurrences inside the window (and after the cursor)"""
+    query = select(*columns) if columns else select(Event)
+    query = query.where(Event.rrule.isnot(None), Event.date <= recurrence_window_end(end_time))
+    lower = max(filter(None, [to_naive_utc(start_time), after[0] if after else None]), default=None)
+    if lower is not None:
+        query = query.where(or_(Event.recurrence_end.is_(None), Event.recurrence_end >= lower))
+    if visibility:
+        query = query.where(Event.visibility == parse_visibility(visibility))
+    return query
+
+def apply_keyset(query, after: Optional[Tuple[datetime, int]], limit: Optional[int]):
+    """Restrict a one-off events query to rows after the keyset position"""
+    query = query.where(Event.rrule.is_(None))
+    if after:
+        query = query.where(tuple_(Event.date, Event.id) > tuple_(*after))
+    return query.limit(limit) if limit is not None else query
+
+def _response_with_date(event: BaseModel, date: datetime) -> BaseModel:
+    return event.model_copy(update={"date": date})
+
+def _project(events: List[BaseModel], fields: Optional[Tuple[str, ...]]) -> List[BaseModel]:
+    """Drop the internal key fields that were read but not requested"""
+    if fields is None or fields == listing_field_names(fields):
+        return events
+    model = event_response_model(fields)
+    return [model.model_validate(event) for event in events]
+
+def _load_fields(query, fields: Optional[Tuple[str, ...]]):
+    """Narrow an ORM events query to the columns behind the requested fields"""
+    if fields is None:
+        return query
+    return query.options(load_only(*(getattr(Event, name) for name in listing_field_names(fields))))
+
+async def get_events_service(
+    db: AsyncSession,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    visibility: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
+) -> List[BaseModel]:
+    """
+    Get events with optional filtering, expanding recurring series inside the
+    window. With fields, only those columns (plus id, date and rrule) are read.
+    """
+    model = event_response_model(listing_field_names(fields))
+    query = apply_keyset(
+        _load_fields(build_events_query(start_time, end_time, visibility), fields), None, None
+    )
+    singles = (await db.execute(query)).scalars().all()
+    series = (await db.execute(
+        _load_fields(build_series_query(start_time, end_time, visibility), fields)
+    )).scalars().all()
+    
+    events = merge_occurrences(
+        (model.model_validate(event) for event in singles),
+        [model.model_validate(event) for event in series],
+        key=lambda event: (event.date, event.id),
+        rrule_of=lambda event: event.rrule,
+        with_date=_response_with_date,
+        window_start=start_time,
+        window_end=recurrence_window_end(end_time),
+    )
+    return _project(events, fields)
+
+async def get_events_page_service(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    visibility: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
+) -> Tuple[List[BaseModel], Optional[str]]:
+    """
+    Get one page of events using keyset pagination.
+    
+    The cursor encodes the (date, id) of the last row of the previous page, so
+    each page is an index range scan and costs the same however deep the client
+    pages. Recurring series are expanded lazily, at most one page per series.
+    Raises ValueError if the cursor is malformed.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    model = event_response_model(listing_field_names(fields))
+    
+    # Fetch one extra row to learn whether another page exists
+    query = apply_keyset(
+        _load_fields(build_events_query(start_time, end_time, visibility), fields), after, limit + 1
+    )
+    singles = (await db.execute(query)).scalars().all()
+    series = (await db.execute(
+        _load_fields(build_series_query(start_time, end_time, visibility, after=after), fields)
+    )).scalars().all()
+    
+    events = merge_occurrences(
+        (model.model_validate(event) for event in singles),
+        [model.model_validate(event) for event in series],
+        key=lambda event: (event.date, event.id),
+        rrule_of=lambda event: event.rrule,
+        with_date=_response_with_date,
+        window_start=start_time,
+        window_end=recurrence_window_end(end_time),
+        after=after,
+        limit=limit + 1,
+    )
+    
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = encode_cursor(events[-1].date, events[-1].id)
+    
+    return _project(events, fields), next_cursor
+
+async def fetch_events_page_json(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    visibility: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Fast read path for one page of events.
+    
+    Selects plain Core rows over the EventResponse columns and encodes them
+    straight to JSON bytes, skipping ORM identity mapping and per-row Pydantic
+    validation. Rows come from our own schema, so they already match
+    EventResponse. With fields, only those columns (plus id, date and rrule)
+    are selected, so large text columns are neither read nor sent.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    columns = [Event.__table__.c[name] for name in listing_field_names(fields)]
+    query = apply_keyset(build_events_query(start_time, end_time, visibility, columns), after, limit + 1)
+    series_query = build_series_query(start_time, end_time, visibility, columns, after)
+    
+    conn = await db.connection()
+    singles = [dict(row) for row in (await conn.execute(query)).mappings()]
+    series = [dict(row) for row in (await conn.execute(series_query)).mappings()]
+    
+    rows = merge_occurrences(
+        singles,
+        series,
+        key=lambda row: (row["date"], row["id"]),
+        rrule_of=lambda row: row["rrule"],
+        with_date=lambda row, date: {**row, "date": date},
+        window_start=start_time,
+        window_end=recurrence_window_end(end_time),
+        after=after,
+        limit=limit + 1,
+    )
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["date"], rows[-1]["id"])
+    
+    if fields is not None:
+        rows = [{name: row[name] for name in fields} for row in rows]
+    return to_json(rows), next_cursor
+
+async def get_events_page_json_service(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    visibility: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Get one page of events as serialized JSON, served from the listing cache
+    when possible.
+    """
+    key = (
+        start_time.isoformat() if start_time else None,
+        end_time.isoformat() if end_time else None,
+        visibility.lower() if visibility else None,
+        limit,
+        cursor,
+        fields,
+    )
+    cached = events_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    generation = events_cache.generation
+    page = await fetch_events_page_json(db, limit, cursor, start_time, end_time, visibility, fields)
+    events_cache.set(key, page, generation)
+    return page
+
+async def search_events_service(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    visibility: Optional[str] = None
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Full-text search over event name and description, ordered by relevance.
+    
+    Matches come from the GIN index on search_vector; only matching rows are
+    ranked. Pages use a (rank, id) keyset cursor. Raises ValueError if the
+    cursor is malformed.
+    """
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), q)
+    rank = func.ts_rank(Event.search_vector, tsquery)
+    
+    query = select(*EVENT_RESPONSE_COLUMNS, rank.label("rank")).where(
+        Event.search_vector.op("@@")(tsquery),
+        *event_filters(start_time, end_time, visibility)
+    )
+    if cursor:
+        after_rank, after_id = decode_rank_cursor(cursor)
+        # ts_rank returns real; compare at the same precision the cursor was taken at
+        after_rank = cast(after_rank, REAL)
+        query = query.where(or_(rank < after_rank, and_(rank == after_rank, Event.id > after_id)))
+    query = query.order_by(rank.desc(), Event.id).limit(limit + 1)
+    
+    conn = await db.connection()
+    rows = [dict(row) for row in (await conn.execute(query)).mappings()]
     
-    result = await db.execute(query)
-    events = result.scalars().all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_rank_cursor(rows[-1]["rank"], rows[-1]["id"])
     
-    return [EventResponse.model_validate(event) for event in events]
+    return to_json(rows), next_cursor
@@ -0,0 +1,114 @@
+import asyncio
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+from app.database import get_read_engine
+from app.models import VisibilityEnum, parse_visibility
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# COPY output chunks buffered between the database and a slow client; once the
+# queue is full the COPY stalls, so memory stays bounded regardless of table size
+EXPORT_QUEUE_CHUNKS = 16
+EXPORT_GZIP_LEVEL = 6
+
+# The API spells visibility by value ("university-only"); the column stores enum names
+VISIBILITY_VALUE_SQL = "CASE visibility {} END".format(
+    " ".join(f"WHEN '{member.name}' THEN '{member.value}'" for member in VisibilityEnum)
+)
+
+EXPORT_COLUMNS = (
+    "id, name, date, description, "
+    f"{VISIBILITY_VALUE_SQL} AS visibility, "
+    "location, link, jira_key, rrule, created_at, updated_at"
+)
+
+def build_export_query(
+    export_format: str,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    visibility: Optional[str] = None
+) -> Tuple[str, List, dict]:
+    """
+    The COPY query, its arguments and the COPY options for a format.
+    
+    Rows are exported as stored, so a recurring series appears once with its
+    RRULE rather than expanded.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    
+    conditions, args = [], []
+    if start_time:
+        args.append(start_time)
+        conditions.append(f"date >= ${len(args)}")
+    if end_time:
+        args.append(end_time)
+        conditions.append(f"date <= ${len(args)}")
+    if visibility:
+        args.append(parse_visibility(visibility).name)
+        conditions.append(f"visibility = ${len(args)}::visibilityenum")
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"SELECT {EXPORT_COLUMNS} FROM events{where} ORDER BY date, id"
+    
+    if export_format == "csv":
+        return query, args, {"format": "csv", "header": True}
+    # CSV mode with control-character quote and delimiter writes each JSON
+    # document verbatim; text mode would backslash-escape it. row_to_json
+    # escapes control characters, so neither can occur inside a document.
+    query = f"SELECT row_to_json(e)::text FROM ({query}) AS e"
+    return query, args, {"format": "csv", "quote": "\x01", "delimiter": "\x02"}
+
+async def stream_export(
+    export_format: str,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    visibility: Optional[str] = None,
+    gzip: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Stream the events table as NDJSON or CSV straight from COPY ... TO STDOUT.
+    
+    COPY runs on the asyncpg connection under the read engine and hands its
+    output to a bounded queue, which this generator drains, compressing on the
+    fly when asked. If the client goes away, the COPY is cancelled.
+    """
+    query, args, options = build_export_query(export_format, start_time, end_time, visibility)
+    queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=EXPORT_QUEUE_CHUNKS)
+    
+    async def copy_out():
+        try:
+            async with get_read_engine().connect() as conn:
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_from_query(query, *args, output=queue.put, **options)
+        except asyncio.CancelledError:
+            raise  # The consumer is gone; nobody is waiting for the end marker
+        except Exception:
+            await queue.put(None)
+            raise
+        await queue.put(None)
+    
+    producer = asyncio.create_task(copy_out())
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if gzip else None
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                break
+            # asyncpg hands out bytearrays; StreamingResponse only passes bytes through
+            chunk = compressor.compress(chunk) if compressor else bytes(chunk)
+            if chunk:
+                yield chunk
+        await producer  # Surface a failed COPY instead of ending the stream cleanly
+        if compressor:
+            yield compressor.flush()
+    finally:
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except (asyncio.CancelledError, Exception):
+                pass
@@ -0,0 +1,209 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from sqlalchemy import delete, extract, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import IdempotencyKey
+from app.utils.logging import logger
+from app.utils.metrics import registry, Counter, Gauge
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+CLEANUP_BATCH_SIZE = 5000
+
+IDEMPOTENT_REQUESTS = registry.register(Counter(
+    "idempotent_requests_total",
+    "Requests carrying an Idempotency-Key, by how they were answered",
+    ("outcome",),
+))
+
+# Receives the response so it can be stored in the same transaction as the write
+RecordResponse = Callable[[dict], Awaitable[None]]
+
+class IdempotencyKeyMismatch(ValueError):
+    """The key was already used for a request with a different body"""
+
+def request_fingerprint(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+@dataclass
+class InFlight:
+    request_hash: str
+    future: "asyncio.Future[Optional[dict]]"
+
+class IdempotencyStore:
+    """
+    Replays the stored response for a repeated Idempotency-Key.
+
+    A bounded in-process LRU answers most retries without a query. Behind it,
+    the idempotency_keys row is claimed (INSERT ... ON CONFLICT) in the same
+    transaction as the write and carries the response, so a request retried on
+    another worker waits for the first to commit and then replays it. Within a
+    process, concurrent duplicates await the first request instead of queueing
+    on the row lock. Failed requests store nothing and may be retried.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float, dict]]" = OrderedDict()
+        self._inflight: Dict[str, InFlight] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _cached(self, key: str, request_hash: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_hash, expires_at, response = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        if stored_hash != request_hash:
+            raise IdempotencyKeyMismatch("Idempotency-Key was already used with a different request body")
+        self._entries.move_to_end(key)
+        return response
+
+    def _remember(self, key: str, request_hash: str, response: dict, ttl_seconds: float) -> None:
+        if self.max_entries <= 0 or ttl_seconds <= 0:
+            return
+        self._entries[key] = (request_hash, time.monotonic() + ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def run(
+        self,
+        db: AsyncSession,
+        key: str,
+        request_hash: str,
+        handler: Callable[[RecordResponse], Awaitable[dict]],
+    ) -> Tuple[dict, bool]:
+        """
+        Return (response, replayed). The handler performs the write and must
+        await the given callback with its response before committing.
+        """
+        while True:
+            response = self._cached(key, request_hash)
+            if response is not None:
+                IDEMPOTENT_REQUESTS.inc("cached")
+                return response, True
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            if pending.request_hash != request_hash:
+                raise IdempotencyKeyMismatch("Idempotency-Key is in use by a request with a different body")
+            # Shielded so a disconnecting duplicate does not cancel the shared result
+            response = await asyncio.shield(pending.future)
+            if response is not None:
+                IDEMPOTENT_REQUESTS.inc("coalesced")
+                return response, True
+            # The first request failed; try again ourselves
+
+        pending = InFlight(request_hash, asyncio.get_running_loop().create_future())
+        self._inflight[key] = pending
+        response = None
+        try:
+            response, replayed = await self._execute(db, key, request_hash, handler)
+            return response, replayed
+        finally:
+            del self._inflight[key]
+            pending.future.set_result(response)
+
+    async def _execute(
+        self,
+        db: AsyncSession,
+        key: str,
+        request_hash: str,
+        handler: Callable[[RecordResponse], Awaitable[dict]],
+    ) -> Tuple[dict, bool]:
+        expires_at = func.now() + timedelta(seconds=self.ttl_seconds)
+        claim = pg_insert(IdempotencyKey).values(key=key, request_hash=request_hash, expires_at=expires_at)
+        claim = claim.on_conflict_do_update(
+            index_elements=[IdempotencyKey.key],
+            set_={"request_hash": request_hash, "response": None, "created_at": func.now(), "expires_at": expires_at},
+            where=IdempotencyKey.expires_at <= func.now(),
+        ).returning(IdempotencyKey.key)
+        # Blocks while another worker's transaction holds the same key
+        claimed = (await db.execute(claim)).scalar_one_or_none()
+
+        if claimed is None:
+            stored = (await db.execute(
+                select(
+                    IdempotencyKey.request_hash,
+                    IdempotencyKey.response,
+                    extract("epoch", IdempotencyKey.expires_at - func.now()).label("ttl"),
+                ).where(IdempotencyKey.key == key)
+            )).one()
+            await db.rollback()
+            if stored.request_hash != request_hash:
+                raise IdempotencyKeyMismatch("Idempotency-Key was already used with a different request body")
+            self._remember(key, request_hash, stored.response, float(stored.ttl))
+            IDEMPOTENT_REQUESTS.inc("stored")
+            return stored.response, True
+
+        async def record(response: dict) -> None:
+            await db.execute(
+                update(IdempotencyKey).where(IdempotencyKey.key == key).values(response=response)
+            )
+
+        response = await handler(record)
+        self._remember(key, request_hash, response, self.ttl_seconds)
+        IDEMPOTENT_REQUESTS.inc("executed")
+        return response, False
+
+    async def delete_expired(self) -> int:
+        """Delete expired keys in batches; returns the number removed"""
+        expired = (
+            select(IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= func.now())
+            .limit(CLEANUP_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        removed = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired)))
+                await db.commit()
+            removed += result.rowcount
+            if result.rowcount < CLEANUP_BATCH_SIZE:
+                return removed
+
+    async def start(self) -> None:
+        if self._task is None and settings.idempotency_cleanup_interval_seconds > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.idempotency_cleanup_interval_seconds)
+            try:
+                removed = await self.delete_expired()
+                if removed:
+                    logger.info("Deleted %s expired idempotency keys", removed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Idempotency key cleanup failed: %s", exc)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "in_flight": len(self._inflight)}
+
+idempotency_store = IdempotencyStore(settings.idempotency_cache_max_entries, settings.idempotency_ttl_seconds)
+
+registry.register(Gauge(
+    "idempotency_store",
+    "Idempotency-Key cache occupancy",
+    ("stat",),
+    lambda: {(name,): value for name, value in idempotency_store.stats().items()},
+))
@@ -1,30 +1,102 @@
-import os
+import asyncio
+import base64
+import random
+import time
 import httpx
-from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.models import Event
+from sqlalchemy import bindparam, insert, select, update, func
+from app.models import Event, SyncState
 from app.config import settings
-from datetime import datetime
-
-load_dotenv()
+from app.services.enrichment_service import enrichment_worker
+from app.services.event_service import invalidate_event_caches
+from app.services.live_service import publish_event_change
+from app.utils.metrics import JIRA_REQUEST_DURATION
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+from zoneinfo import ZoneInfo
 
 JIRA_BASE_URL = settings.jira_url
 JIRA_USER_EMAIL = settings.jira_username
 JIRA_API_TOKEN = settings.jira_api_token
 JIRA_PROJECT_KEY = "EV" # Rokas Event Calendar
+JIRA_SYNC_STATE = "jira"
 
-import base64
+def jira_headers() -> dict:
+    """Basic auth headers, built when the client is created rather than at import"""
+    # Concatenate email and API token with a colon, then base64 encode it
+    auth_value = f"{JIRA_USER_EMAIL}:{JIRA_API_TOKEN}"
+    encoded_auth = base64.b64encode(auth_value.encode("utf-8")).decode("utf-8")
+    return {
+        "Authorization": f"Basic {encoded_auth}",
+        "Content-Type": "application/json"
+    }
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Shared client so connections and TLS sessions are reused across Jira calls
+_client: Optional[httpx.AsyncClient] = None
+
+async def start_jira_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """
+    Create the long-lived Jira HTTP client. Called from the app lifespan; tests
+    can pass an httpx.MockTransport.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = httpx.AsyncClient(
+        headers=jira_headers(),
+        transport=transport,
+        timeout=settings.jira_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.jira_max_concurrency * 2,
+            max_keepalive_connections=settings.jira_max_concurrency,
+        ),
+    )
+    return _client
+
+async def close_jira_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+async def get_jira_client() -> httpx.AsyncClient:
+    # Fall back to lazy creation for scripts that run outside the app lifespan
+    if _client is None:
+        return await start_jira_client()
+    return _client
 
-# Concatenate email and API token with a colon
-auth_value = f"{JIRA_USER_EMAIL}:{JIRA_API_TOKEN}"
-# Base64 encode the string
-encoded_auth = base64.b64encode(auth_value.encode("utf-8")).decode("utf-8")
+def _retry_delay(response: Optional[httpx.Response], attempt: int) -> float:
+    if response is not None and "Retry-After" in response.headers:
+        try:
+            return float(response.headers["Retry-After"])
+        except ValueError:
+            pass
+    # Exponential backoff with full jitter
+    return random.uniform(0, settings.jira_retry_backoff_seconds * (2 ** attempt))
 
-HEADERS = {
-    "Authorization": f"Basic {encoded_auth}",
-    "Content-Type": "application/json"
-}
+async def jira_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request to Jira, retrying 429/5xx responses and transport errors
+    with exponential backoff.
+    """
+    client = await get_jira_client()
+    for attempt in range(settings.jira_max_retries + 1):
+        response = None
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            JIRA_REQUEST_DURATION.observe(time.perf_counter() - started, method, str(response.status_code))
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+        except httpx.TransportError as exc:
+            JIRA_REQUEST_DURATION.observe(time.perf_counter() - started, method, type(exc).__name__)
+            if attempt == settings.jira_max_retries:
+                raise
+        if attempt < settings.jira_max_retries:
+            await asyncio.sleep(_retry_delay(response, attempt))
+    return response
 
 async def test_jira_connection():
     """
@@ -32,8 +104,7 @@ async def test_jira_connection():
     """
     url = f"{JIRA_BASE_URL}/rest/api/3/myself"  # This will fetch information about the authenticated user.
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=HEADERS)
+    response = await jira_request("GET", url)
 
     if response.status_code == 200:
         return {"message": "Connection successful!", "jira_user_info": response.json()}
@@ -46,51 +117,178 @@ async def fetch_jira_page():
     """
     url = f"{JIRA_BASE_URL}/rest/api/3/project/{JIRA_PROJECT_KEY}"
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=HEADERS)
+    response = await jira_request("GET", url)
     
     if response.status_code != 200:
         raise Exception(f"Failed to fetch Jira page: {response.text}")
     
     return response.json()
 
-async def fetch_jira_events():
-    """
-    Fetches event issues from Jira using JQL query.
-    """
+async def fetch_jira_search_page(jql_query: str, start_at: int) -> dict:
     url = f"{JIRA_BASE_URL}/rest/api/3/search"
-    jql_query = f'project="{JIRA_PROJECT_KEY}" ORDER BY created DESC'
+    params = {"jql": jql_query, "startAt": start_at, "maxResults": settings.jira_page_size}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=HEADERS, params={"jql": jql_query, "maxResults": 20})
+    response = await jira_request("GET", url, params=params)
     
     if response.status_code != 200:
         raise Exception(f"Failed to fetch Jira events: {response.text}")
     
-    return response.json().get("issues", [])
+    return response.json()
+
+def build_jql(updated_since: Optional[datetime] = None) -> str:
+    # Pages are fetched concurrently by offset, so the order must not change while
+    # they are read: ordering by updated would move an issue edited mid-fetch to the
+    # end and shift every later offset, skipping another issue
+    if updated_since is None:
+        return f'project="{JIRA_PROJECT_KEY}" ORDER BY key ASC'
+    # JQL dates have minute precision and use the Jira user's timezone; ">=" keeps
+    # the boundary minute, which is safe to re-apply because the sync upserts
+    local = updated_since.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(settings.jira_timezone))
+    return (
+        f'project="{JIRA_PROJECT_KEY}" AND updated >= "{local.strftime("%Y/%m/%d %H:%M")}" '
+        f'ORDER BY key ASC'
+    )
+
+async def fetch_jira_events(updated_since: Optional[datetime] = None):
+    """
+    Fetches all event issues from Jira using JQL query, optionally only those
+    updated since the given (naive UTC) timestamp.
+
+    The first page reports the total number of matching issues; the remaining
+    pages are then fetched concurrently, bounded by jira_max_concurrency.
+    """
+    jql_query = build_jql(updated_since)
+
+    first_page = await fetch_jira_search_page(jql_query, 0)
+    issues = list(first_page.get("issues", []))
+    total = first_page.get("total", len(issues))
+    page_size = first_page.get("maxResults") or settings.jira_page_size
+
+    semaphore = asyncio.Semaphore(settings.jira_max_concurrency)
+
+    async def fetch_page(start_at: int) -> list:
+        async with semaphore:
+            page = await fetch_jira_search_page(jql_query, start_at)
+        return page.get("issues", [])
+
+    pages = await asyncio.gather(
+        *(fetch_page(start_at) for start_at in range(len(issues), total, page_size))
+    )
+    for page in pages:
+        issues.extend(page)
+    
+    return issues
+
+def parse_jira_datetime(value: Any) -> Optional[datetime]:
+    """Parse a Jira date or datetime string into a naive UTC datetime"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%d"):
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def adf_to_text(node: Any) -> str:
+    """Flatten an Atlassian Document Format description into plain text"""
+    if node is None:
+        return ""
+    if isinstance(node, str):
+        return node
+    if node.get("type") == "text":
+        return node.get("text", "")
+    parts = [adf_to_text(child) for child in node.get("content", [])]
+    separator = "\n" if node.get("type") == "doc" else ""
+    return separator.join(parts)
+
+def issue_to_event_row(issue: dict) -> dict:
+    fields = issue["fields"]
+    return {
+        "jira_key": issue["key"],
+        "name": fields["summary"][:200],
+        "date": parse_jira_datetime(fields.get("customfield_10010")) or datetime.utcnow(),  # Adjust if Jira has a custom date field
+        "description": adf_to_text(fields.get("description")),
+        "visibility": "public",  # Adjust if needed
+        "location": fields.get("customfield_10020", None),  # Adjust if Jira has a location field
+        "link": f"{JIRA_BASE_URL}/browse/{issue['key']}",
+    }
+
+JIRA_UPDATE_COLUMNS = ("name", "date", "description", "location", "link")
+
+async def upsert_jira_events(db: AsyncSession, rows: List[dict]) -> None:
+    """
+    Insert or update events by Jira issue key in batches.
+    
+    The partitioned events table cannot enforce a unique jira_key, so there is
+    no ON CONFLICT target: existing keys are updated by id (moving the row to
+    another partition if its date changed) and the rest inserted. Syncs are
+    serialized by the advisory lock in sync_service, so no other writer races
+    this between the lookup and the insert.
+    """
+    table = Event.__table__
+    update_stmt = (
+        update(table)
+        .where(table.c.id == bindparam("event_id"))
+        .values({**{name: bindparam(f"new_{name}") for name in JIRA_UPDATE_COLUMNS}, "updated_at": func.now()})
+    )
+    batch_size = settings.bulk_insert_batch_size
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        existing = dict((await db.execute(
+            select(Event.jira_key, Event.id).where(Event.jira_key.in_([row["jira_key"] for row in batch]))
+        )).all())
+        updates = [
+            {"event_id": existing[row["jira_key"]], **{f"new_{name}": row[name] for name in JIRA_UPDATE_COLUMNS}}
+            for row in batch if row["jira_key"] in existing
+        ]
+        inserts = [row for row in batch if row["jira_key"] not in existing]
+        if updates:
+            await db.execute(update_stmt, updates)
+        if inserts:
+            await db.execute(insert(Event), inserts)
 
 async def sync_jira_events(db: AsyncSession = None):
     """
-    Fetches events from Jira and updates them in PostgreSQL.
+    Fetches events from Jira and upserts them into PostgreSQL.
+
+    Only issues updated since the stored high-water mark are fetched, and rows
+    are matched on the Jira issue key, so repeated syncs are idempotent and
+    cost time in proportion to what changed.
     """
-    jira_events = await fetch_jira_events()
-    events_to_insert = []
-
-    for issue in jira_events:
-        event_data = {
-            "name": issue["fields"]["summary"],
-            "date": issue["fields"].get("customfield_10010", datetime.utcnow()),  # Adjust if Jira has a custom date field
-            "description": issue["fields"].get("description", ""),
-            "visibility": "public",  # Adjust if needed
-            "location": issue["fields"].get("customfield_10020", None),  # Adjust if Jira has a location field
-            "link": f"{JIRA_BASE_URL}/browse/{issue['key']}",
-        }
-        events_to_insert.append(event_data)
-
-    if events_to_insert and db:
-        for event_data in events_to_insert:
-            db_event = Event(**event_data)
-            db.add(db_event)
+    state = await db.get(SyncState, JIRA_SYNC_STATE) if db else None
+    watermark = state.watermark if state else None
+
+    fetch_started = datetime.utcnow()
+    jira_events = await fetch_jira_events(watermark)
+    events_to_upsert = [issue_to_event_row(issue) for issue in jira_events]
+
+    if events_to_upsert and db:
+        # Keep the latest row per issue key so a key is never inserted twice
+        rows = list({row["jira_key"]: row for row in events_to_upsert}.values())
+        await upsert_jira_events(db, rows)
+
+        updated = [parse_jira_datetime(issue["fields"].get("updated")) for issue in jira_events]
+        updated = [value for value in updated if value is not None]
+        if updated:
+            if state is None:
+                state = SyncState(name=JIRA_SYNC_STATE)
+                db.add(state)
+            # Never past the start of the fetch: an issue updated while pages were
+            # being read may have been missed and must match the next sync
+            state.watermark = min(max(updated + ([watermark] if watermark else [])), fetch_started)
+        await publish_event_change(db, {"op": "refresh", "source": "jira", "count": len(rows)})
         await db.commit()
+        invalidate_event_caches()
+        # Unchanged descriptions hash to existing cache rows, so re-imports cost no model calls
+        enrichment_worker.wake()
     
-    return {"message": f"Synced {len(events_to_insert)} events from Jira"}
\ No newline at end of file
+    return {"message": f"Synced {len(events_to_upsert)} events from Jira"}
@@ -0,0 +1,187 @@
+import asyncio
+import json
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, List, Optional, Set, Tuple
+import asyncpg
+from pydantic_core import to_json
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.utils.logging import logger
+from app.utils.metrics import registry, Gauge
+
+EVENT_FEED_CHANNEL = "event_feed"
+
+async def publish_event_change(db: AsyncSession, payload: dict) -> None:
+    """
+    Queue a live feed message in the current transaction.
+    
+    NOTIFY is transactional, so listeners only see the message once the
+    surrounding transaction commits, and never if it rolls back.
+    """
+    await db.execute(
+        text(
+            "SELECT pg_notify(:channel, "
+            "(CAST(:payload AS jsonb) || jsonb_build_object('seq', nextval('event_feed_seq')))::text)"
+        ),
+        {"channel": EVENT_FEED_CHANNEL, "payload": to_json(payload).decode("utf-8")},
+    )
+
+@dataclass(eq=False)
+class Subscriber:
+    queue: "asyncio.Queue[Optional[Tuple[str, dict]]]"
+    visibility: Optional[str] = None
+    dropped: bool = False
+
+    def wants(self, message: dict) -> bool:
+        visibility = message.get("visibility")
+        return self.visibility is None or visibility is None or visibility == self.visibility
+
+@dataclass
+class EventBroadcaster:
+    """
+    Fans out event_feed notifications to SSE clients of this worker.
+    
+    Each worker holds a single dedicated LISTEN connection, outside the
+    SQLAlchemy pool. Every client gets a bounded queue; a client that falls
+    behind is dropped instead of buffering without limit, and resumes through
+    Last-Event-ID from the replay buffer when it reconnects.
+    """
+    queue_size: int
+    buffer_size: int
+    _subscribers: Set[Subscriber] = field(default_factory=set)
+    _buffer: Deque[Tuple[str, dict]] = field(default_factory=deque)
+    _task: Optional[asyncio.Task] = None
+
+    def __post_init__(self):
+        self._buffer = deque(maxlen=self.buffer_size)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscriber in list(self._subscribers):
+            self._drop(subscriber)
+
+    async def _listen_forever(self) -> None:
+        dsn = settings.database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        backoff = 1.0
+        while True:
+            try:
+                conn = await asyncpg.connect(dsn)
+                try:
+                    # Messages sent while disconnected are lost, so positions in
+                    # the old buffer can no longer prove a client is up to date
+                    self._buffer.clear()
+                    await conn.add_listener(EVENT_FEED_CHANNEL, self._on_notification)
+                    backoff = 1.0
+                    while not conn.is_closed():
+                        await asyncio.sleep(5)
+                finally:
+                    await conn.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Live feed listener disconnected: %s", exc)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        self.publish_local(str(message.pop("seq", "")), message)
+
+    def publish_local(self, message_id: str, message: dict) -> None:
+        """Buffer a message and hand it to every interested subscriber"""
+        entry = (message_id, message)
+        self._buffer.append(entry)
+        for subscriber in list(self._subscribers):
+            if not subscriber.wants(message):
+                continue
+            try:
+                subscriber.queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        subscriber.dropped = True
+        # Discard the backlog and wake the client so its stream ends promptly
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def subscribe(
+        self, visibility: Optional[str] = None, last_event_id: Optional[str] = None
+    ) -> Tuple[Subscriber, Optional[List[Tuple[str, dict]]]]:
+        """
+        Register a client. Returns the messages to replay after last_event_id,
+        or None if they are no longer buffered and the client must refetch.
+        """
+        subscriber = Subscriber(asyncio.Queue(maxsize=self.queue_size), visibility)
+        replay: Optional[List[Tuple[str, dict]]] = []
+        if last_event_id:
+            ids = [message_id for message_id, _ in self._buffer]
+            if last_event_id in ids:
+                position = ids.index(last_event_id)
+                replay = [
+                    entry for entry in list(self._buffer)[position + 1:] if subscriber.wants(entry[1])
+                ]
+            else:
+                replay = None
+        self._subscribers.add(subscriber)
+        return subscriber, replay
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+broadcaster = EventBroadcaster(settings.sse_queue_size, settings.sse_replay_buffer_size)
+
+registry.register(Gauge(
+    "sse_subscribers", "Connected live feed clients", (), lambda: {(): broadcaster.subscriber_count},
+))
+
+def format_sse(message_id: Optional[str], event: str, data: dict) -> str:
+    lines = []
+    if message_id:
+        lines.append(f"id: {message_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+async def stream_events(subscriber: Subscriber, replay: Optional[List[Tuple[str, dict]]]) -> AsyncIterator[str]:
+    """Render a subscriber's messages as an SSE stream, with periodic keep-alives"""
+    try:
+        yield "retry: 3000\n\n"
+        if replay is None:
+            # Too far behind to resume; tell the client to refetch the listing once
+            yield format_sse(None, "reset", {"reason": "history unavailable"})
+        else:
+            for message_id, message in replay:
+                yield format_sse(message_id, message.get("op", "change"), message)
+        while True:
+            try:
+                entry = await asyncio.wait_for(subscriber.queue.get(), settings.sse_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if entry is None:
+                return
+            yield format_sse(entry[0], entry[1].get("op", "change"), entry[1])
+    finally:
+        broadcaster.unsubscribe(subscriber)
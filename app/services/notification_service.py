@@ -0,0 +1,306 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol
+import httpx
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import NotificationOutbox
+from app.utils.logging import logger
+from app.utils.metrics import registry, Counter
+
+SLACK_CHANNEL = "slack"
+DIGEST_MAX_LINES = 20
+
+NOTIFICATIONS_SENT = registry.register(Counter(
+    "notifications_sent_total", "Outbound notifications delivered", ("channel",),
+))
+NOTIFICATION_FAILURES = registry.register(Counter(
+    "notification_failures_total", "Outbound notification delivery attempts that failed", ("channel",),
+))
+
+@dataclass
+class OutboxItem:
+    id: int
+    payload: dict
+    attempts: int
+
+class DeliveryError(Exception):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class Spool(Protocol):
+    """Durable storage for pending notifications"""
+
+    async def enqueue(self, db: Optional[AsyncSession], payloads: List[dict]) -> None: ...
+
+    async def claim(self, limit: int) -> List[OutboxItem]: ...
+
+    async def complete(self, items: List[OutboxItem]) -> None: ...
+
+    async def retry(self, items: List[OutboxItem], error: str, retry_after: Optional[float]) -> None: ...
+
+class PostgresOutboxSpool:
+    """
+    Transactional outbox in the notification_outbox table.
+    
+    Rows are written in the caller's transaction, so a notification exists if
+    and only if its event was committed. Claiming takes a short lease with
+    FOR UPDATE SKIP LOCKED, so several workers can drain the outbox without
+    sending anything twice.
+    """
+
+    LEASE_SECONDS = 60
+
+    def __init__(self, channel: str = SLACK_CHANNEL):
+        self.channel = channel
+
+    async def enqueue(self, db: Optional[AsyncSession], payloads: List[dict]) -> None:
+        if payloads:
+            await db.execute(
+                insert(NotificationOutbox),
+                [{"channel": self.channel, "payload": payload} for payload in payloads],
+            )
+
+    async def claim(self, limit: int) -> List[OutboxItem]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text("""
+                    UPDATE notification_outbox
+                    SET next_attempt_at = now() + make_interval(secs => :lease),
+                        attempts = attempts + 1
+                    WHERE id IN (
+                        SELECT id FROM notification_outbox
+                        WHERE channel = :channel AND status = 'pending' AND next_attempt_at <= now()
+                        ORDER BY next_attempt_at, id
+                        LIMIT :limit
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, payload, attempts
+                """),
+                {"channel": self.channel, "limit": limit, "lease": self.LEASE_SECONDS},
+            )
+            items = [OutboxItem(row.id, row.payload, row.attempts) for row in result]
+            await db.commit()
+        return sorted(items, key=lambda item: item.id)
+
+    async def complete(self, items: List[OutboxItem]) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text("UPDATE notification_outbox SET status = 'sent', sent_at = now() WHERE id = ANY(:ids)"),
+                {"ids": [item.id for item in items]},
+            )
+            await db.commit()
+
+    async def retry(self, items: List[OutboxItem], error: str, retry_after: Optional[float]) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                text("""
+                    UPDATE notification_outbox
+                    SET status = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'pending' END,
+                        next_attempt_at = now() + make_interval(
+                            secs => greatest(:retry_after, :base * power(2, attempts - 1))
+                        ),
+                        last_error = :error
+                    WHERE id = ANY(:ids)
+                """),
+                {
+                    "ids": [item.id for item in items],
+                    "max_attempts": settings.notification_max_attempts,
+                    "base": settings.notification_retry_base_seconds,
+                    "retry_after": retry_after or 0,
+                    "error": error[:1000],
+                },
+            )
+            await db.commit()
+
+class MemorySpool:
+    """Non-durable spool for tests and local development"""
+
+    def __init__(self):
+        self._next_id = 1
+        self.pending: Dict[int, OutboxItem] = {}
+        self.due_at: Dict[int, float] = {}
+        self.sent: List[OutboxItem] = []
+        self.failed: List[OutboxItem] = []
+
+    async def enqueue(self, db: Optional[AsyncSession], payloads: List[dict]) -> None:
+        for payload in payloads:
+            self.pending[self._next_id] = OutboxItem(self._next_id, payload, 0)
+            self.due_at[self._next_id] = 0.0
+            self._next_id += 1
+
+    async def claim(self, limit: int) -> List[OutboxItem]:
+        now = time.monotonic()
+        due = [item for item_id, item in sorted(self.pending.items()) if self.due_at[item_id] <= now][:limit]
+        for item in due:
+            item.attempts += 1
+            self.due_at[item.id] = now + PostgresOutboxSpool.LEASE_SECONDS
+        return due
+
+    async def complete(self, items: List[OutboxItem]) -> None:
+        for item in items:
+            self.sent.append(self.pending.pop(item.id))
+
+    async def retry(self, items: List[OutboxItem], error: str, retry_after: Optional[float]) -> None:
+        for item in items:
+            if item.attempts >= settings.notification_max_attempts:
+                self.failed.append(self.pending.pop(item.id))
+                continue
+            delay = max(retry_after or 0, settings.notification_retry_base_seconds * 2 ** (item.attempts - 1))
+            self.due_at[item.id] = time.monotonic() + delay
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    # Retry-After may also be an HTTP-date; leave those to the spool's backoff
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+class SlackWebhookSender:
+    """Posts messages to a Slack incoming webhook, spacing them to respect its rate limit"""
+
+    # Longest wait for a send slot while holding a claimed batch. Together with the
+    # request timeout it stays inside PostgresOutboxSpool.LEASE_SECONDS, so the
+    # lease cannot expire and let another worker send the same batch.
+    MAX_WAIT_SECONDS = 30.0
+    TIMEOUT_SECONDS = 10.0
+
+    def __init__(self, webhook_url: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.webhook_url = webhook_url
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._next_slot = 0.0
+
+    async def open(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(transport=self.transport, timeout=self.TIMEOUT_SECONDS)
+
+    async def send(self, message: str) -> None:
+        # Per-webhook rate limit: one message per slack_min_interval_seconds
+        delay = self._next_slot - time.monotonic()
+        if delay > self.MAX_WAIT_SECONDS:
+            raise DeliveryError("Slack webhook still rate limited", delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._next_slot = time.monotonic() + settings.slack_min_interval_seconds
+        
+        await self.open()
+        try:
+            response = await self._client.post(self.webhook_url, json={"text": message})
+        except httpx.HTTPError as exc:
+            raise DeliveryError(f"Slack webhook request failed: {exc}")
+        if response.status_code == 429:
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                self._next_slot = time.monotonic() + retry_after
+            raise DeliveryError("Slack webhook rate limited", retry_after)
+        if response.status_code >= 400:
+            raise DeliveryError(f"Slack webhook returned {response.status_code}: {response.text[:200]}")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+def render_digest(items: List[OutboxItem]) -> str:
+    """One message per burst: a single event on its own, or a digest listing"""
+    def line(payload: dict) -> str:
+        return f"*{payload.get('name')}* on {payload.get('date')} ({payload.get('visibility')})"
+
+    if len(items) == 1:
+        return f"New event: {line(items[0].payload)}"
+    lines = [f"{len(items)} new events:"]
+    lines.extend(f"• {line(item.payload)}" for item in items[:DIGEST_MAX_LINES])
+    if len(items) > DIGEST_MAX_LINES:
+        lines.append(f"…and {len(items) - DIGEST_MAX_LINES} more")
+    return "\n".join(lines)
+
+class NotificationDispatcher:
+    """
+    Background worker that drains the spool off the request path.
+    
+    Writers enqueue into the spool inside their own transaction and call
+    wake() after committing. The dispatcher then waits a short digest window so
+    a burst of events becomes one message, sends it, and retries failures with
+    exponential backoff. It also polls periodically to pick up retries and rows
+    written by other workers.
+    """
+
+    def __init__(self, spool: Spool, sender: Optional[SlackWebhookSender]):
+        self.spool = spool
+        self.sender = sender
+        # Created in start(): on Python 3.9 an Event binds to the loop current at construction
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.sender is not None
+
+    async def enqueue(self, db: Optional[AsyncSession], payloads: List[dict]) -> None:
+        if self.enabled:
+            await self.spool.enqueue(db, payloads)
+
+    def wake(self) -> None:
+        if self.enabled and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            await self.sender.open()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.sender is not None:
+            await self.sender.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.notification_poll_seconds)
+                await asyncio.sleep(settings.notification_digest_window_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.drain()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Notification dispatch failed: %s", exc)
+
+    async def drain(self) -> int:
+        """Deliver every due notification, one digest per batch; returns the number sent"""
+        sent = 0
+        while True:
+            items = await self.spool.claim(settings.notification_batch_size)
+            if not items:
+                return sent
+            try:
+                await self.sender.send(render_digest(items))
+            except DeliveryError as exc:
+                NOTIFICATION_FAILURES.inc(SLACK_CHANNEL)
+                await self.spool.retry(items, str(exc), exc.retry_after)
+                return sent
+            await self.spool.complete(items)
+            NOTIFICATIONS_SENT.inc(SLACK_CHANNEL, amount=len(items))
+            sent += len(items)
+
+def build_dispatcher() -> NotificationDispatcher:
+    webhook_url = settings.slack_webhook_url
+    sender = SlackWebhookSender(webhook_url) if webhook_url and webhook_url.startswith("https://") else None
+    return NotificationDispatcher(PostgresOutboxSpool(), sender)
+
+notification_dispatcher = build_dispatcher()
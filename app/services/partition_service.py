@@ -0,0 +1,158 @@
+import asyncio
+import re
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal, advisory_lock
+from app.utils.logging import logger
+
+# events is range-partitioned by month on date (migration 0011). Rows outside
+# the premade months land in events_default; detached months move to this schema.
+ARCHIVE_SCHEMA = "events_archive"
+DEFAULT_PARTITION = "events_default"
+PARTITION_NAME = re.compile(r"^events_p(\d{4})(\d{2})$")
+
+def add_months(month: date, count: int) -> date:
+    """First day of the month `count` months after the month of `month`"""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"events_p{month:%Y%m}"
+
+def partition_month(name: str) -> Optional[date]:
+    """The month a monthly partition covers, or None for any other table"""
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+async def list_partitions(db: AsyncSession) -> List[dict]:
+    """Attached partitions with their bounds and planner row estimates"""
+    result = await db.execute(text("""
+        SELECT c.relname AS name,
+               pg_get_expr(c.relpartbound, c.oid) AS bounds,
+               greatest(c.reltuples, 0)::bigint AS estimated_rows
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'events'::regclass
+        ORDER BY c.relname
+    """))
+    return [dict(row._mapping) for row in result]
+
+async def ensure_partitions(db: AsyncSession, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    """
+    Create the monthly partitions from this month through `months_ahead` months
+    ahead; returns the names created. The caller commits.
+
+    Each month is built as a standalone table and attached, which locks the
+    parent less than CREATE TABLE ... PARTITION OF. Rows that already sit in
+    the default partition for that month are moved into it first, since the
+    attach would otherwise fail; the statement-level rollup triggers live on
+    the parent, so the move leaves the statistics untouched.
+    """
+    this_month = (today or date.today()).replace(day=1)
+    existing = {row["name"] for row in await list_partitions(db)}
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(this_month, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        following = add_months(month, 1)
+        bounds = {"start": month, "end": following}
+        await db.execute(text(f"CREATE TABLE {name} (LIKE events INCLUDING DEFAULTS)"))
+        await db.execute(
+            text(f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """),
+            bounds,
+        )
+        await db.execute(text(
+            f"ALTER TABLE events ATTACH PARTITION {name} FOR VALUES FROM ('{month}') TO ('{following}')"
+        ))
+        created.append(name)
+    return created
+
+async def archive_partitions(db: AsyncSession, older_than_months: int, today: Optional[date] = None) -> List[str]:
+    """
+    Detach monthly partitions that ended more than `older_than_months` months
+    ago and move them into the archive schema; returns the names archived. The
+    caller commits.
+
+    A month holding a recurring series that still produces occurrences after
+    the cutoff stays attached, so listings keep expanding it. Archived rows
+    remain counted in the statistics rollup.
+    """
+    if older_than_months <= 0:
+        return []
+    cutoff = add_months((today or date.today()).replace(day=1), -older_than_months)
+    archived = []
+    for row in await list_partitions(db):
+        month = partition_month(row["name"])
+        if month is None or add_months(month, 1) > cutoff:
+            continue
+        active_series = await db.scalar(
+            text(f"""
+                SELECT EXISTS (
+                    SELECT 1 FROM {row['name']}
+                    WHERE rrule IS NOT NULL AND (recurrence_end IS NULL OR recurrence_end >= :cutoff)
+                )
+            """),
+            {"cutoff": cutoff},
+        )
+        if active_series:
+            logger.info("Keeping partition %s attached: it holds active recurring series", row["name"])
+            continue
+        await db.execute(text(f"ALTER TABLE events DETACH PARTITION {row['name']}"))
+        await db.execute(text(f"ALTER TABLE {row['name']} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        archived.append(row["name"])
+    return archived
+
+class PartitionMaintainer:
+    """
+    Background task that keeps future partitions premade and archives old
+    ones. Runs at startup and then periodically; an advisory lock keeps
+    concurrent workers from racing on the same DDL.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None and settings.partition_maintenance_interval_seconds > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Partition maintenance failed: %s", exc)
+            await asyncio.sleep(settings.partition_maintenance_interval_seconds)
+
+    async def run_once(self) -> Optional[dict]:
+        """Create and archive partitions; None if another worker holds the lock"""
+        async with advisory_lock("events_partitions") as acquired:
+            if not acquired:
+                return None
+            async with AsyncSessionLocal() as db:
+                created = await ensure_partitions(db, settings.partition_months_ahead)
+                archived = await archive_partitions(db, settings.partition_archive_after_months)
+                await db.commit()
+        if created or archived:
+            logger.info("Partition maintenance created %s, archived %s", created, archived)
+        return {"created": created, "archived": archived}
+
+partition_maintainer = PartitionMaintainer()
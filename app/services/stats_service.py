@@ -0,0 +1,66 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select, func, cast, delete, insert, literal_column, text, Date, DateTime
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Event, EventDailyCount, parse_visibility
+
+STATS_BUCKETS = ("day", "week", "month")
+
+async def get_event_stats_service(
+    db: AsyncSession,
+    bucket: str = "day",
+    visibility: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None
+) -> List[dict]:
+    """
+    Event counts per bucket and visibility, read from the daily rollup.
+    
+    Weeks and months are summed from the daily rows, so the cost depends on
+    the number of days in range, not the number of events. Recurring series
+    count once, on the day of their first occurrence.
+    """
+    if bucket not in STATS_BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(STATS_BUCKETS)}")
+    
+    # The unit is inlined (it is whitelisted above) so the SELECT and GROUP BY
+    # expressions render identically
+    bucket_start = cast(
+        func.date_trunc(literal_column(f"'{bucket}'"), cast(EventDailyCount.day, DateTime)), Date
+    ).label("bucket")
+    query = select(bucket_start, EventDailyCount.visibility, func.sum(EventDailyCount.count).label("count"))
+    
+    conditions = [EventDailyCount.count > 0]
+    if start_time:
+        conditions.append(EventDailyCount.day >= start_time.date())
+    if end_time:
+        conditions.append(EventDailyCount.day <= end_time.date())
+    if visibility:
+        conditions.append(EventDailyCount.visibility == parse_visibility(visibility))
+    
+    query = (
+        query.where(*conditions)
+        .group_by(bucket_start, EventDailyCount.visibility)
+        .order_by(bucket_start, EventDailyCount.visibility)
+    )
+    result = await db.execute(query)
+    return [{"bucket": row.bucket, "visibility": row.visibility, "count": row.count} for row in result]
+
+async def rebuild_event_stats(db: AsyncSession) -> int:
+    """
+    Recompute the rollup from the events table; returns the number of rollup rows.
+    
+    Writers are blocked (readers are not) for the duration, so the rebuilt
+    counts match the table exactly when it commits.
+    """
+    await db.execute(text("LOCK TABLE events IN SHARE MODE"))
+    await db.execute(delete(EventDailyCount))
+    day = cast(Event.date, Date)
+    result = await db.execute(
+        insert(EventDailyCount).from_select(
+            ["day", "visibility", "count"],
+            select(day, Event.visibility, func.count()).group_by(day, Event.visibility),
+        )
+    )
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,109 @@
+import asyncio
+import uuid
+from typing import Optional, Set
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import AsyncSessionLocal, advisory_lock
+from app.models import SyncJob
+from app.services.jira_service import sync_jira_events
+from app.utils.logging import logger
+
+JIRA_SOURCE = "jira"
+
+class JiraSyncScheduler:
+    """
+    Runs the Jira sync in the background, periodically and on demand.
+    
+    Every worker runs the schedule, but a sync first takes a session-level
+    Postgres advisory lock on a dedicated connection, so only one worker across
+    all replicas syncs at a time; the others skip that round. Jobs are recorded
+    in sync_jobs, so any worker can report on a job another one ran.
+    """
+
+    def __init__(self, source: str = JIRA_SOURCE):
+        self.source = source
+        self._task: Optional[asyncio.Task] = None
+        self._jobs: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if self._task is None and settings.jira_sync_interval_seconds > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        tasks = list(self._jobs) + ([self._task] if self._task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._jobs.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.jira_sync_interval_seconds)
+            try:
+                await self.run(trigger="scheduled")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Scheduled Jira sync failed: %s", exc)
+
+    async def trigger(self) -> SyncJob:
+        """Queue a sync in the background and return its job immediately"""
+        job = await self._create_job("manual", "queued")
+        task = asyncio.create_task(self.run(job_id=job.id, trigger="manual"))
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+        return job
+
+    async def run(self, job_id: Optional[str] = None, trigger: str = "manual") -> Optional[str]:
+        """
+        Sync if no other worker holds the lock. Returns the final job status, or
+        None for a scheduled round that was skipped (those are not recorded).
+        """
+        async with advisory_lock(f"{self.source}_sync") as acquired:
+            if not acquired:
+                if job_id is None:
+                    return None
+                await self._finish_job(job_id, "skipped", "Another sync was already running")
+                return "skipped"
+            if job_id is None:
+                job_id = (await self._create_job(trigger, "running")).id
+            else:
+                await self._update_job(job_id, status="running", started_at=func.now())
+            try:
+                async with AsyncSessionLocal() as db:
+                    result = await sync_jira_events(db)
+            except Exception as exc:
+                logger.warning("Jira sync job %s failed: %s", job_id, exc)
+                await self._finish_job(job_id, "failed", str(exc))
+                return "failed"
+            await self._finish_job(job_id, "succeeded", result.get("message"))
+            return "succeeded"
+
+    async def _create_job(self, trigger: str, status: str) -> SyncJob:
+        async with AsyncSessionLocal() as db:
+            job = SyncJob(
+                id=uuid.uuid4().hex,
+                source=self.source,
+                trigger=trigger,
+                status=status,
+                started_at=func.now() if status == "running" else None,
+            )
+            db.add(job)
+            await db.commit()
+            await db.refresh(job)
+            return job
+
+    async def _update_job(self, job_id: str, **values) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(SyncJob).where(SyncJob.id == job_id).values(**values))
+            await db.commit()
+
+    async def _finish_job(self, job_id: str, status: str, message: Optional[str]) -> None:
+        await self._update_job(job_id, status=status, message=message, finished_at=func.now())
+
+async def get_sync_job_service(job_id: str, db: AsyncSession) -> Optional[SyncJob]:
+    return await db.get(SyncJob, job_id)
+
+jira_sync_scheduler = JiraSyncScheduler()
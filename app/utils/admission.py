@@ -0,0 +1,223 @@
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from app.config import settings
+from app.database import engine_options
+from app.utils.metrics import registry, Counter, Gauge
+
+ADMISSION_REJECTIONS = registry.register(Counter(
+    "admission_rejections_total",
+    "Requests turned away before reaching a route",
+    ("reason",),
+))
+
+# (method, path prefix, tokens per second, burst); method "*" matches any
+RateRule = Tuple[str, str, float, float]
+
+def parse_rate_rules(rules: Dict[str, List[float]]) -> List[RateRule]:
+    """
+    Turn {"GET /calendar.ics": [rate, burst], "*": [rate, burst]} into rules
+    ordered so the longest matching path prefix wins.
+    """
+    parsed = []
+    for route, (rate, burst) in rules.items():
+        method, _, prefix = route.partition(" ") if route != "*" else ("*", "", "")
+        parsed.append((method.upper(), prefix, float(rate), float(burst)))
+    return sorted(parsed, key=lambda rule: (len(rule[1]), rule[0] != "*"), reverse=True)
+
+class TokenBuckets:
+    """
+    Per-client token buckets, one per (rule, client) pair.
+
+    Each bucket is a (tokens, updated_at) tuple refilled lazily on access. A
+    bucket idle long enough to have refilled completely is indistinguishable
+    from a new one, so sweep() drops those to keep memory bounded by the
+    number of recently active clients.
+    """
+
+    def __init__(self, rules: List[RateRule], sweep_seconds: float, max_clients: int):
+        self.rules = rules
+        self.sweep_seconds = sweep_seconds
+        self.max_clients = max_clients
+        self._buckets: Dict[Tuple[int, str], Tuple[float, float]] = {}
+        self._last_sweep = time.monotonic()
+
+    def match(self, method: str, path: str) -> Optional[int]:
+        for index, (rule_method, prefix, rate, _) in enumerate(self.rules):
+            if rule_method in ("*", method) and path.startswith(prefix):
+                return index if rate > 0 else None
+        return None
+
+    def take(self, method: str, path: str, client: str) -> float:
+        """Spend one token; returns 0 if allowed, else seconds until a token is available"""
+        index = self.match(method, path)
+        if index is None:
+            return 0.0
+        _, _, rate, burst = self.rules[index]
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_seconds or len(self._buckets) >= self.max_clients:
+            self.sweep(now)
+        key = (index, client)
+        tokens, updated_at = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated_at) * rate)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / rate
+        self._buckets[key] = (tokens - 1, now)
+        return 0.0
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop buckets that have refilled to their burst; returns the number dropped"""
+        now = time.monotonic() if now is None else now
+        idle = [
+            key for key, (tokens, updated_at) in self._buckets.items()
+            if tokens + (now - updated_at) * self.rules[key[0]][2] >= self.rules[key[0]][3]
+        ]
+        for key in idle:
+            del self._buckets[key]
+        # Still over capacity: forget the least recently inserted clients
+        overflow = len(self._buckets) - self.max_clients
+        if overflow >= 0:
+            for key in list(self._buckets)[:overflow + 1 + self.max_clients // 10]:
+                del self._buckets[key]
+        self._last_sweep = now
+        return len(idle)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+class ConcurrencyLimiter:
+    """
+    Caps requests in flight. Past the cap a short, bounded queue absorbs
+    bursts; anything beyond it, or waiting longer than queue_timeout, is
+    rejected instead of piling up on the database pool.
+    """
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        if len(self._waiters) >= self.queue_size or self.queue_timeout <= 0:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            return False
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the client went away
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return True
+
+    def release(self) -> None:
+        # Hand the slot straight to the oldest waiter so it cannot be overtaken
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+def default_concurrency_limit() -> int:
+    """One request per primary pool connection, including overflow"""
+    options = engine_options()
+    return options["pool_size"] + options["max_overflow"]
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware that rejects work the server cannot absorb.
+
+    Requests first spend a token from their client's bucket for the matching
+    route rule (429 when empty), then take a slot from a global limiter sized
+    to the database pool (503 when it and its short queue are full). Both
+    answers carry Retry-After so well-behaved clients back off.
+    """
+
+    def __init__(self, app, buckets: "TokenBuckets" = None, limiter: ConcurrencyLimiter = None):
+        self.app = app
+        # An empty TokenBuckets is falsy (__len__), so test for None explicitly
+        self.buckets = buckets if buckets is not None else rate_buckets
+        self.limiter = limiter if limiter is not None else concurrency_limiter
+        self.exempt_paths = tuple(settings.admission_exempt_paths)
+
+    def client_id(self, scope) -> str:
+        if settings.rate_limit_trust_forwarded_for:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        wait = self.buckets.take(scope["method"], scope["path"], self.client_id(scope))
+        if wait > 0:
+            ADMISSION_REJECTIONS.inc("rate_limited")
+            await reject(send, 429, "Rate limit exceeded", wait)
+            return
+        if not await self.limiter.acquire():
+            ADMISSION_REJECTIONS.inc("overloaded")
+            await reject(send, 503, "Server is busy", settings.admission_retry_after_seconds)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release()
+
+rate_buckets = TokenBuckets(
+    parse_rate_rules(settings.rate_limit_rules),
+    settings.rate_limit_sweep_seconds,
+    settings.rate_limit_max_clients,
+)
+concurrency_limiter = ConcurrencyLimiter(
+    settings.admission_max_concurrency or default_concurrency_limit(),
+    settings.admission_queue_size,
+    settings.admission_queue_timeout_seconds,
+)
+
+registry.register(Gauge(
+    "admission_state",
+    "Admission control occupancy",
+    ("stat",),
+    lambda: {
+        ("active",): concurrency_limiter.active,
+        ("waiting",): concurrency_limiter.waiting,
+        ("tracked_clients",): len(rate_buckets),
+    },
+))
+
+async def reject(send, status: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -1,4 +1,62 @@
-from datetime import datetime
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
 
 def format_date(date: datetime) -> str:
     return date.strftime("%Y-%m-%d %H:%M:%S")
+
+def accepts_encoding(header: Optional[str], coding: str) -> bool:
+    """Whether an Accept-Encoding header allows `coding`, honouring q-values and `*`"""
+    qualities = {}
+    for item in (header or "").split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.lower()] = quality
+    quality = qualities.get(coding, qualities.get("*", 0.0))
+    return quality > 0
+
+def _encode_token(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_token(token: str) -> Any:
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+def encode_cursor(date: datetime, event_id: int) -> str:
+    """Encode a (date, id) keyset position as an opaque URL-safe token"""
+    return _encode_token([date.isoformat(), event_id])
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a token produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        date_str, event_id = _decode_token(cursor)
+        date = datetime.fromisoformat(date_str)
+        # Event dates are naive UTC; an aware timestamp cannot be compared with them
+        if date.tzinfo is not None:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+        return date, int(event_id)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+def encode_rank_cursor(rank: float, event_id: int) -> str:
+    """Encode a (rank, id) keyset position for relevance-ordered results"""
+    return _encode_token([rank, event_id])
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a token produced by encode_rank_cursor, raising ValueError if malformed"""
+    try:
+        rank, event_id = _decode_token(cursor)
+        return float(rank), int(event_id)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
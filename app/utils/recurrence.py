@@ -0,0 +1,109 @@
+import heapq
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from dateutil.rrule import rrule as RRule, rrulestr
+
+T = TypeVar("T")
+
+# Bounded series longer than this are rejected; their end is computed on every write
+MAX_OCCURRENCES = 10000
+
+def normalize_rrule(value: str) -> str:
+    """Strip an optional "RRULE:" prefix and upper-case the rule body"""
+    value = value.strip()
+    if value.upper().startswith("RRULE:"):
+        value = value[len("RRULE:"):]
+    return value.upper()
+
+def parse_rrule(value: str, dtstart: datetime):
+    """Parse an RRULE body anchored at dtstart, raising ValueError if invalid"""
+    rule = rrulestr(normalize_rrule(value), dtstart=dtstart)
+    if not isinstance(rule, RRule):
+        raise ValueError("Only a single RRULE is supported")
+    return rule
+
+def check_occurrence_limit(rule) -> None:
+    """Raise ValueError if a bounded (COUNT or UNTIL) rule has more than MAX_OCCURRENCES occurrences"""
+    if rule._count is not None:
+        occurrences = rule._count
+    elif rule._until is not None:
+        # Never steps further than MAX_OCCURRENCES + 1, however distant UNTIL is
+        occurrences = sum(1 for _ in islice(rule, MAX_OCCURRENCES + 1))
+    else:
+        return
+    if occurrences > MAX_OCCURRENCES:
+        raise ValueError(f"Recurring series may have at most {MAX_OCCURRENCES} occurrences")
+
+def recurrence_end(value: str, dtstart: datetime) -> Optional[datetime]:
+    """Last occurrence of a bounded (COUNT or UNTIL) rule, or None if it never ends"""
+    rule = parse_rrule(value, dtstart)
+    if rule._until is not None:
+        return rule.before(rule._until, inc=True)
+    if rule._count is None:
+        return None
+    last = None
+    for last in rule:
+        pass
+    return last
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Event dates are stored as naive UTC
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def occurrence_dates(
+    rrule: str,
+    dtstart: datetime,
+    window_start: Optional[datetime],
+    window_end: datetime,
+    after: Optional[datetime] = None,
+    after_inclusive: bool = True,
+) -> Iterator[datetime]:
+    """
+    Lazily yield occurrences inside [window_start, window_end], optionally only
+    those after a keyset position. Nothing outside the window is generated, so
+    cost depends on the window, not on how far the series runs.
+    """
+    lower, inclusive = window_start or dtstart, True
+    if after is not None and after >= lower:
+        lower, inclusive = after, after_inclusive
+    for occurrence in parse_rrule(rrule, dtstart).xafter(lower, inc=inclusive):
+        if occurrence > window_end:
+            return
+        yield occurrence
+
+def merge_occurrences(
+    singles: Iterable[T],
+    series: Iterable[T],
+    key: Callable[[T], Tuple[datetime, int]],
+    rrule_of: Callable[[T], str],
+    with_date: Callable[[T, datetime], T],
+    window_start: Optional[datetime],
+    window_end: datetime,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: Optional[int] = None,
+) -> List[T]:
+    """
+    Merge one-off events (already in (date, id) order) with the expanded
+    occurrences of recurring series, in (date, id) order, after an optional
+    keyset position and up to an optional limit.
+    """
+    window_start, window_end = to_naive_utc(window_start), to_naive_utc(window_end)
+    streams = [iter(singles)]
+    for item in series:
+        dtstart, series_id = key(item)
+        occurrences = occurrence_dates(
+            rrule_of(item),
+            dtstart,
+            window_start,
+            window_end,
+            after=after[0] if after else None,
+            # At the cursor date, only series ordered after the cursor id are still due
+            after_inclusive=after is None or series_id > after[1],
+        )
+        dated = (with_date(item, occurrence) for occurrence in occurrences)
+        streams.append(islice(dated, limit) if limit is not None else dated)
+    merged = heapq.merge(*streams, key=key)
+    return list(islice(merged, limit) if limit is not None else merged)
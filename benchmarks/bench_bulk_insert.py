@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Compare insert throughput of the single-item and bulk event creation paths.
+
+Runs against the database configured in DATABASE_URL and removes the rows it
+creates afterwards.
+
+Usage: python -m benchmarks.bench_bulk_insert [--rows 5000] [--output results.json]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+from app.database import AsyncSessionLocal, engine
+from app.models import Event, EventCreate
+from benchmarks.common import write_results
+from app.services.event_service import create_event_service, bulk_create_events_service
+
+BENCH_PREFIX = "bench-bulk-insert"
+
+def make_items(count: int) -> list:
+    start = datetime(2030, 1, 1)
+    return [
+        {
+            "name": f"{BENCH_PREFIX} {i}",
+            "date": (start + timedelta(hours=i)).isoformat(),
+            "description": "Synthetic event created by the bulk insert benchmark",
+            "visibility": "public",
+        }
+        for i in range(count)
+    ]
+
+async def iter_items(items: list):
+    for item in items:
+        yield item
+
+async def bench_single(items: list) -> float:
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        for item in items:
+            await create_event_service(EventCreate.model_validate(item), db)
+        return time.perf_counter() - started
+
+async def bench_bulk(items: list) -> float:
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        result = await bulk_create_events_service(iter_items(items), db)
+        elapsed = time.perf_counter() - started
+    assert result["failed"] == 0, result
+    return elapsed
+
+async def cleanup():
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Event).where(Event.name.like(f"{BENCH_PREFIX}%")))
+        await db.commit()
+
+async def main(rows: int, output: str):
+    engine.echo = False
+    items = make_items(rows)
+    try:
+        single = await bench_single(items)
+        await cleanup()
+        bulk = await bench_bulk(items)
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+    print(f"rows: {rows}")
+    print(f"single-item: {rows / single:10.0f} rows/s ({single:.2f}s)")
+    print(f"bulk:        {rows / bulk:10.0f} rows/s ({bulk:.2f}s)")
+    print(f"speedup:     {single / bulk:10.1f}x")
+    write_results("bulk_insert", {
+        "rows": rows,
+        "single_rows_per_s": rows / single,
+        "bulk_rows_per_s": rows / bulk,
+        "speedup": single / bulk,
+    }, output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.output))
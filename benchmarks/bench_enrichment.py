@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare per-event LLM calls with the cached, batched enrichment stage.
+
+Runs entirely in memory against FakeEnrichmentClient with a simulated model
+latency, so it needs neither a database nor an API key. The event stream
+repeats descriptions the way a Jira re-sync does.
+
+Usage: python -m benchmarks.bench_enrichment [--events 2000] [--distinct 400] [--latency-ms 200] [--output results.json]
+"""
+import argparse
+import asyncio
+import random
+import time
+from app.config import settings
+from app.services.enrichment_service import EnrichmentWorker, FakeEnrichmentClient, MemoryEnrichmentStore
+from benchmarks.common import write_results
+
+TOPICS = ["AI", "Robotics", "Music", "Hackathon", "Career", "Design", "Startup", "Climate"]
+KINDS = ["Talk", "Workshop", "Meetup", "Lecture", "Seminar"]
+
+def descriptions(events: int, distinct: int) -> list:
+    rng = random.Random(42)
+    pool = [
+        f"A {rng.choice(KINDS).lower()} on {rng.choice(TOPICS).lower()} (session {index}). Bring a laptop."
+        for index in range(distinct)
+    ]
+    # Re-imports reformat whitespace, which normalization absorbs
+    return [rng.choice(pool).replace(" ", "  " if rng.random() < 0.2 else " ") for _ in range(events)]
+
+async def per_event(items: list, latency: float) -> dict:
+    client = FakeEnrichmentClient(latency)
+    started = time.perf_counter()
+    for description in items:
+        await client.enrich([description])
+    return {"calls": len(client.calls), "seconds": round(time.perf_counter() - started, 3)}
+
+async def batched(items: list, latency: float) -> dict:
+    client = FakeEnrichmentClient(latency)
+    store = MemoryEnrichmentStore()
+    worker = EnrichmentWorker(store, client)
+    started = time.perf_counter()
+    for description in items:
+        store.add(description)
+    enriched = await worker.drain()
+    return {
+        "calls": len(client.calls),
+        "enriched": enriched,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+async def main(events: int, distinct: int, latency_ms: float, output: str):
+    items = descriptions(events, distinct)
+    latency = latency_ms / 1000
+    results = {
+        "events": events,
+        "distinct": distinct,
+        "latency_ms": latency_ms,
+        "batch_size": settings.enrichment_batch_size,
+        "max_concurrency": settings.enrichment_max_concurrency,
+        "batched": await batched(items, latency),
+    }
+    # The naive baseline is slow by design; time a sample and extrapolate
+    sample = items[: min(len(items), 50)]
+    baseline = await per_event(sample, latency)
+    results["per_event"] = {
+        "calls": events,
+        "seconds": round(baseline["seconds"] * events / len(sample), 3),
+        "extrapolated_from": len(sample),
+    }
+
+    for name in ("per_event", "batched"):
+        stats = results[name]
+        print(f"{name:10} {stats['calls']:6d} calls   {stats['seconds']:9.3f} s")
+    write_results("enrichment", results, output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.events, args.distinct, args.latency_ms, args.output))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Compare full-row listings with sparse fieldsets (fields=id,name,date).
+
+Seeds synthetic events with descriptions long enough to be TOAST-ed in the
+database configured in DATABASE_URL and removes them afterwards. Both runs
+use the listing's fast path, so the difference is the columns read and sent.
+
+Usage: python -m benchmarks.bench_fields [--rows 20000] [--page-size 1000] [--repeat 5] [--output results.json]
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import delete, text
+from app.database import AsyncSessionLocal, engine
+from app.models import Event
+from app.services.event_service import fetch_events_page_json
+from benchmarks.common import write_results
+
+BENCH_PREFIX = "bench-fields"
+
+# About 4 KB of description per row, past the 2 KB TOAST threshold
+SEED_SQL = text("""
+    INSERT INTO events (name, date, description, visibility, created_at, updated_at)
+    SELECT
+        :prefix || ' ' || n,
+        timestamp '2030-01-01' + n * interval '1 minute',
+        repeat(md5(n::text), 128),
+        'PUBLIC',
+        now(),
+        now()
+    FROM generate_series(1, :rows) AS n
+""")
+
+VARIANTS = [
+    ("full", None),
+    ("id_name_date", ("id", "name", "date")),
+]
+
+async def measure(page_size: int, repeat: int, fields) -> dict:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            body, _ = await fetch_events_page_json(db, page_size, visibility="public", fields=fields)
+            best = min(best, time.perf_counter() - started)
+            size = len(body)
+    return {"best_ms": best * 1000, "payload_bytes": size}
+
+async def main(rows: int, page_size: int, repeat: int, output: str):
+    engine.echo = False
+    async with AsyncSessionLocal() as db:
+        await db.execute(SEED_SQL, {"prefix": BENCH_PREFIX, "rows": rows})
+        await db.commit()
+    try:
+        results = {name: await measure(page_size, repeat, fields) for name, fields in VARIANTS}
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Event).where(Event.name.like(f"{BENCH_PREFIX}%")))
+            await db.commit()
+        await engine.dispose()
+
+    print(f"page size: {page_size} (best of {repeat})")
+    for name, _ in VARIANTS:
+        stats = results[name]
+        print(f"{name:14} {stats['best_ms']:8.1f} ms   {stats['payload_bytes'] / 1024:10.1f} KiB")
+    full, sparse = results["full"], results["id_name_date"]
+    print(f"speedup: {full['best_ms'] / sparse['best_ms']:.1f}x, "
+          f"payload: {full['payload_bytes'] / sparse['payload_bytes']:.1f}x smaller")
+    write_results("fields", {"page_size": page_size, **results}, output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.repeat, args.output))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Compare the ORM + Pydantic listing path with the Core-row, direct-to-JSON path.
+
+Seeds synthetic events in the database configured in DATABASE_URL and
+removes them afterwards.
+
+Usage: python -m benchmarks.bench_read_path [--rows 20000] [--page-size 1000] [--repeat 5] [--output results.json]
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import delete, text
+from app.database import AsyncSessionLocal, engine
+from app.models import Event
+from benchmarks.common import write_results
+from app.services.event_service import (
+    EVENT_LIST_ADAPTER,
+    fetch_events_page_json,
+    get_events_page_service,
+)
+
+BENCH_PREFIX = "bench-read-path"
+
+SEED_SQL = text("""
+    INSERT INTO events (name, date, description, visibility, created_at, updated_at)
+    SELECT
+        :prefix || ' ' || n,
+        timestamp '2030-01-01' + n * interval '1 minute',
+        repeat('Synthetic description ', 5),
+        'PUBLIC',
+        now(),
+        now()
+    FROM generate_series(1, :rows) AS n
+""")
+
+async def orm_path(db, page_size: int) -> bytes:
+    # What the route did before: ORM entities, model_validate, then response_model re-validation
+    events, _ = await get_events_page_service(db, page_size, visibility="public")
+    return EVENT_LIST_ADAPTER.dump_json(EVENT_LIST_ADAPTER.validate_python(events))
+
+async def fast_path(db, page_size: int) -> bytes:
+    body, _ = await fetch_events_page_json(db, page_size, visibility="public")
+    return body
+
+async def measure(path, page_size: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            await path(db, page_size)
+            best = min(best, time.perf_counter() - started)
+    return best
+
+async def main(rows: int, page_size: int, repeat: int, output: str):
+    engine.echo = False
+    async with AsyncSessionLocal() as db:
+        await db.execute(SEED_SQL, {"prefix": BENCH_PREFIX, "rows": rows})
+        await db.commit()
+    try:
+        orm = await measure(orm_path, page_size, repeat)
+        fast = await measure(fast_path, page_size, repeat)
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Event).where(Event.name.like(f"{BENCH_PREFIX}%")))
+            await db.commit()
+        await engine.dispose()
+
+    print(f"page size: {page_size} (best of {repeat})")
+    print(f"orm + pydantic: {page_size / orm:10.0f} rows/s ({orm * 1000:.1f} ms)")
+    print(f"core + to_json: {page_size / fast:10.0f} rows/s ({fast * 1000:.1f} ms)")
+    print(f"speedup:        {orm / fast:10.1f}x")
+    write_results("read_path", {
+        "page_size": page_size,
+        "orm_rows_per_s": page_size / orm,
+        "fast_rows_per_s": page_size / fast,
+        "speedup": orm / fast,
+    }, output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.repeat, args.output))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Measure full-text search latency on the events in DATABASE_URL.
+
+Seed a realistic table first, e.g. make bench-data ROWS=1000000. Each query
+is run through search_events_service exactly as GET /events/search does.
+
+Usage: python -m benchmarks.bench_search [--repeat 50] [--target-ms 10] [--output results.json]
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import func, select
+from app.database import AsyncSessionLocal, engine
+from app.models import Event
+from app.services.event_service import search_events_service
+from benchmarks.common import percentiles, write_results
+
+QUERIES = [
+    ("single_term", "robotics", None),
+    ("two_terms", "robotics workshop", None),
+    ("phrase", '"career fair"', None),
+    ("public_only", "hackathon", "public"),
+    ("rare_term", "nonexistentterm", None),
+]
+
+async def main(repeat: int, target_ms: float, output: str):
+    engine.echo = False
+    results = {}
+    try:
+        async with AsyncSessionLocal() as db:
+            results["rows"] = await db.scalar(select(func.count()).select_from(Event))
+            for name, q, visibility in QUERIES:
+                await search_events_service(db, q, 20, visibility=visibility)  # Warm up
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    await search_events_service(db, q, 20, visibility=visibility)
+                    samples.append(time.perf_counter() - started)
+                results[name] = {"q": q, "visibility": visibility, **percentiles(samples)}
+    finally:
+        await engine.dispose()
+
+    for name, q, _ in QUERIES:
+        stats = results[name]
+        verdict = "ok" if stats["p50_ms"] <= target_ms else "SLOW"
+        print(f"{name:12} {q!r:22} p50 {stats['p50_ms']:7.2f} ms   p95 {stats['p95_ms']:7.2f} ms   {verdict}")
+    results["target_ms"] = target_ms
+    write_results("search", results, output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--target-ms", type=float, default=10.0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat, args.target_ms, args.output))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Measure cold-start cost: import time of app.main and time to first healthy response.
+
+Each run uses a fresh interpreter, as a newly scheduled container would.
+`python -X importtime` gives the cumulative import cost per top-level
+package; the server run starts uvicorn on the app factory and polls /health
+until it answers 200. Neither step needs a reachable database.
+
+Usage: python -m benchmarks.bench_startup [--runs 5] [--port 8765] [--top 15] [--output results.json]
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+import httpx
+from benchmarks.common import percentiles, write_results
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def import_profile() -> dict:
+    """Total import time and the most expensive top-level packages, in milliseconds"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, check=True,
+    )
+    packages = defaultdict(float)
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative_us, indent, module = match.groups()
+        # Only outermost imports (one space of indent); nested ones are included in their cumulative time
+        if len(indent) == 1:
+            packages[module.split(".")[0]] += int(cumulative_us)
+            total_us += int(cumulative_us)
+    return {"total_ms": total_us / 1000, "packages_ms": {name: us / 1000 for name, us in packages.items()}}
+
+def time_to_healthy(port: int, timeout: float = 30.0) -> float:
+    """Seconds from process start until GET /health returns 200"""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:create_app", "--factory",
+         "--port", str(port), "--log-level", "warning"],
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                if process.poll() is not None:
+                    raise RuntimeError(f"Server exited with status {process.returncode}")
+                time.sleep(0.01)
+        raise RuntimeError(f"Server was not healthy after {timeout} s")
+    finally:
+        process.terminate()
+        process.wait()
+
+def main(runs: int, port: int, top: int, output: str):
+    profiles = [import_profile() for _ in range(runs)]
+    import_totals = [profile["total_ms"] for profile in profiles]
+    packages = {
+        name: statistics.median(profile["packages_ms"].get(name, 0.0) for profile in profiles)
+        for name in profiles[0]["packages_ms"]
+    }
+    heaviest = dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top])
+    healthy = percentiles([time_to_healthy(port) for _ in range(runs)])
+
+    print(f"import app.main     median {statistics.median(import_totals):8.1f} ms")
+    print(f"first healthy reply p50    {healthy['p50_ms']:8.1f} ms   max {healthy['max_ms']:8.1f} ms")
+    print("heaviest imports:")
+    for name, ms in heaviest.items():
+        print(f"  {name:24} {ms:8.1f} ms")
+    write_results("startup", {
+        "runs": runs,
+        "import_ms": {"median": statistics.median(import_totals), "max": max(import_totals)},
+        "heaviest_imports_ms": heaviest,
+        "time_to_healthy": healthy,
+    }, output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    main(args.runs, args.port, args.top, args.output)
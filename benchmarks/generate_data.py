@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic events in PostgreSQL for benchmarks and load tests.
+
+Rows are produced server-side with generate_series, so 10M events take
+minutes rather than hours. The spread mimics real usage: about a third of
+events lie in the past two years and the rest in the coming year. Most events
+are on weekday afternoons and evenings. Visibility is roughly 60% public,
+30% university-only and 10% private.
+
+Usage: python -m benchmarks.generate_data --rows 1000000 [--clean]
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import delete, text
+from app.database import AsyncSessionLocal, engine
+from app.models import Event
+
+BENCH_PREFIX = "bench-data"
+CHUNK_ROWS = 500_000
+
+GENERATE_SQL = text("""
+    INSERT INTO events (name, date, description, visibility, location, link, created_at, updated_at)
+    SELECT
+        :prefix || ' ' || (ARRAY['AI', 'Robotics', 'Music', 'Hackathon', 'Career', 'Design', 'Startup',
+                                 'Climate', 'Chess', 'Film', 'Yoga', 'Security', 'Data', 'Poetry'])[1 + floor(random() * 14)::int]
+                   || ' ' || (ARRAY['Talk', 'Workshop', 'Meetup', 'Lecture', 'Fair', 'Night', 'Seminar', 'Jam'])[1 + floor(random() * 8)::int]
+                   || ' ' || n,
+        date_trunc('day', day) + (9 + floor(random() * 12)) * interval '1 hour'
+            + (floor(random() * 4) * 15) * interval '1 minute',
+        CASE WHEN random() < 0.2 THEN NULL
+             ELSE repeat('Synthetic event description. ', 1 + floor(random() * 20)::int) END,
+        CASE WHEN r < 0.6 THEN 'PUBLIC'
+             WHEN r < 0.9 THEN 'UNIVERSITY_ONLY'
+             ELSE 'PRIVATE' END::visibilityenum,
+        'Room ' || (1 + floor(random() * 200)::int),
+        CASE WHEN random() < 0.5 THEN 'https://events.example.com/' || n END,
+        now(),
+        now()
+    FROM (
+        SELECT
+            n,
+            random() AS r,
+            -- Roughly a third in the past two years, the rest over the next year
+            CASE WHEN random() < 0.35
+                 THEN now() - random() * interval '730 days'
+                 ELSE now() + random() * interval '365 days' END AS day
+        FROM generate_series(:start, :stop) AS n
+    ) AS seed
+    -- Keep only about 30% of the weekend candidates
+    WHERE extract(isodow FROM day) < 6 OR random() < 0.3
+    LIMIT :limit
+""")
+
+async def generate(rows: int):
+    started = time.perf_counter()
+    inserted = 0
+    start = 1
+    # Weekend candidates are thinned out, so over-generate and cap each chunk with LIMIT
+    while inserted < rows:
+        limit = min(CHUNK_ROWS, rows - inserted)
+        stop = start + limit * 2
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                GENERATE_SQL.bindparams(prefix=BENCH_PREFIX, start=start, stop=stop - 1, limit=limit)
+            )
+            inserted += result.rowcount
+            await db.commit()
+        start = stop
+        print(f"  {inserted:,} rows")
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("ANALYZE events"))
+        await db.commit()
+    print(f"Generated {inserted:,} events in {time.perf_counter() - started:.1f}s")
+
+async def clean():
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(delete(Event).where(Event.name.like(f"{BENCH_PREFIX} %")))
+        await db.commit()
+    print(f"Deleted {result.rowcount:,} generated events")
+
+async def main(rows: int, remove: bool):
+    engine.echo = False
+    try:
+        if remove:
+            await clean()
+        else:
+            await generate(rows)
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--clean", action="store_true", help="Delete previously generated events")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.clean))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Async HTTP load driver for a running API instance.
+
+Keeps a fixed number of concurrent clients hitting each endpoint for a set
+duration, then reports p50/p95/p99 latency and throughput as JSON.
+
+Usage: python -m benchmarks.load [--base-url http://localhost:8000] [--concurrency 32] [--duration 30]
+
+Start the server with rate limiting off (RATE_LIMIT_RULES='{"*": [0, 0]}') or
+raised well above the offered load; otherwise most requests are 429s. Requests
+rejected by admission control (429/503) are counted separately and excluded
+from the latency and throughput figures.
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import List
+import httpx
+from benchmarks.common import percentiles, write_results
+
+# Fast rejections from admission control, not served requests
+REJECTED_STATUSES = (429, 503)
+
+DEFAULT_ENDPOINTS = [
+    "/events/",
+    "/events/?visibility=public",
+    "/calendar.ics",
+]
+
+async def drive(client: httpx.AsyncClient, path: str, concurrency: int, duration: float) -> dict:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                await response.aread()
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+                continue
+            if response.status_code in REJECTED_STATUSES:
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "duration_s": elapsed,
+        "requests_per_s": len(latencies) / elapsed,
+        "rejected": sum(statuses[str(status)] for status in REJECTED_STATUSES),
+        "statuses": dict(statuses),
+        "latency": percentiles(latencies),
+    }
+
+async def main(base_url: str, endpoints: List[str], concurrency: int, duration: float, output: str):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        for path in endpoints:
+            results[path] = await drive(client, path, concurrency, duration)
+            latency = results[path]["latency"]
+            print(
+                f"{path:32} {results[path]['requests_per_s']:8.1f} req/s   "
+                f"p50 {latency.get('p50_ms', 0):8.2f} ms   "
+                f"p95 {latency.get('p95_ms', 0):8.2f} ms   "
+                f"p99 {latency.get('p99_ms', 0):8.2f} ms   "
+                f"rejected {results[path]['rejected']}"
+            )
+    write_results("load", {"base_url": base_url, "endpoints": results}, output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", action="append", dest="endpoints")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(
+        args.base_url, args.endpoints or DEFAULT_ENDPOINTS, args.concurrency, args.duration, args.output
+    ))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the event service hot paths.
+
+Times get_events_service, the paginated listing path, generate_ics and
+create_event_service against whatever data is in DATABASE_URL (seed it with
+benchmarks.generate_data first), and writes the results as JSON.
+
+Usage: python -m benchmarks.micro [--repeat 5] [--creates 200] [--output results.json]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, select
+from app.database import AsyncSessionLocal, engine
+from app.models import Event, EventCreate
+from app.services.calendar_service import generate_ics
+from app.services.event_service import (
+    create_event_service,
+    fetch_events_page_json,
+    get_events_service,
+)
+from benchmarks.common import percentiles, write_results
+
+BENCH_PREFIX = "bench-micro"
+
+async def timed(call, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            await call(db)
+            samples.append(time.perf_counter() - started)
+    return percentiles(samples)
+
+async def bench_create(count: int) -> dict:
+    samples = []
+    base = datetime(2035, 1, 1)
+    async with AsyncSessionLocal() as db:
+        for i in range(count):
+            event = EventCreate(name=f"{BENCH_PREFIX} {i}", date=base + timedelta(hours=i))
+            started = time.perf_counter()
+            await create_event_service(event, db)
+            samples.append(time.perf_counter() - started)
+        await db.execute(delete(Event).where(Event.name.like(f"{BENCH_PREFIX} %")))
+        await db.commit()
+    return percentiles(samples)
+
+async def main(repeat: int, creates: int, output: str):
+    engine.echo = False
+    now = datetime.utcnow()
+    week = (now, now + timedelta(days=7))
+    try:
+        async with AsyncSessionLocal() as db:
+            row_count = await db.scalar(select(func.count()).select_from(Event))
+
+        results = {
+            "rows": row_count,
+            "get_events_service_week": await timed(
+                lambda db: get_events_service(db, *week), repeat
+            ),
+            "get_events_service_week_public": await timed(
+                lambda db: get_events_service(db, *week, "public"), repeat
+            ),
+            "events_page_json_upcoming_public": await timed(
+                lambda db: fetch_events_page_json(db, 100, None, now, None, "public"), repeat
+            ),
+            "generate_ics": await timed(generate_ics, repeat),
+            "create_event_service": await bench_create(creates),
+        }
+    finally:
+        await engine.dispose()
+
+    for name, stats in results.items():
+        if isinstance(stats, dict):
+            print(f"{name:36} p50 {stats['p50_ms']:9.2f} ms   p95 {stats['p95_ms']:9.2f} ms")
+    write_results("micro", results, output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--creates", type=int, default=200)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat, args.creates, args.output))
@@ -1,15 +1,7 @@
-from pymongo import MongoClient
+import asyncio
 from datetime import datetime
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-# MongoDB connection
-uri = os.getenv("MONGO_URI")
-client = MongoClient(uri)
-db = client[os.getenv("DB_NAME")] 
-collection = db["events"]
+from app.database import AsyncSessionLocal, engine
+from app.services.event_service import bulk_create_events_service
 
 # Sample event data
 events = [
@@ -18,31 +10,38 @@ events = [
         "date": datetime(2025, 4, 1, 14, 0, 0),
         "description": "A discussion on the future of AI and its ethical implications.",
         "visibility": "university-only",
-        "created_at": datetime.utcnow()
     },
     {
         "name": "Spring Music Festival",
         "date": datetime(2025, 4, 15, 18, 30, 0),
         "description": "Live music and performances by student bands.",
         "visibility": "public",
-        "created_at": datetime.utcnow()
     },
     {
         "name": "Private Leadership Workshop",
         "date": datetime(2025, 3, 25, 9, 0, 0),
         "description": "Exclusive workshop for student council members.",
         "visibility": "private",
-        "created_at": datetime.utcnow()
     },
     {
         "name": "Hackathon 2025",
         "date": datetime(2025, 4, 20, 9, 0, 0),
         "description": "24-hour coding challenge with exciting prizes.",
         "visibility": "university-only",
-        "created_at": datetime.utcnow()
     }
 ]
 
-# Insert data into MongoDB
-result = collection.insert_many(events)
-print(f"Inserted {len(result.inserted_ids)} events into MongoDB.")
\ No newline at end of file
+async def iter_events():
+    for event in events:
+        yield event
+
+async def main():
+    # Insert data into PostgreSQL
+    async with AsyncSessionLocal() as db:
+        result = await bulk_create_events_service(iter_events(), db)
+    await engine.dispose()
+    print(f"Inserted {result['created']} events into PostgreSQL.")
+    print("For large synthetic datasets use: make bench-data ROWS=1000000")
+
+if __name__ == "__main__":
+    asyncio.run(main())
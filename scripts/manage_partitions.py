@@ -0,0 +1,30 @@
+import argparse
+import asyncio
+from app.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.services.partition_service import archive_partitions, ensure_partitions, list_partitions
+
+async def main(args):
+    # Same steps the background PartitionMaintainer runs, for cron or manual use
+    async with AsyncSessionLocal() as db:
+        if args.command == "ensure":
+            created = await ensure_partitions(db, args.months)
+            await db.commit()
+            print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+        elif args.command == "archive":
+            archived = await archive_partitions(db, args.months)
+            await db.commit()
+            print(f"Archived {len(archived)} partitions: {', '.join(archived) or '-'}")
+        for partition in await list_partitions(db):
+            print(f"{partition['name']:<16} ~{partition['estimated_rows']:>10} rows  {partition['bounds']}")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the monthly partitions of the events table")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ensure = commands.add_parser("ensure", help="Create partitions from this month through --months ahead")
+    ensure.add_argument("--months", type=int, default=settings.partition_months_ahead)
+    archive = commands.add_parser("archive", help="Detach partitions older than --months into events_archive")
+    archive.add_argument("--months", type=int, default=settings.partition_archive_after_months or 24)
+    commands.add_parser("list", help="Show the attached partitions")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,13 @@
+import asyncio
+from app.database import AsyncSessionLocal, engine
+from app.services.stats_service import rebuild_event_stats
+
+async def main():
+    # Backfill or repair the event_daily_counts rollup behind GET /events/stats
+    async with AsyncSessionLocal() as db:
+        rows = await rebuild_event_stats(db)
+    await engine.dispose()
+    print(f"Rebuilt event statistics: {rows} day/visibility rows.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -47,7 +47,7 @@ def setup_database():
     print("\n🎉 Database setup completed!")
     print("\nNext steps:")
     print("1. Start the application: docker-compose up")
-    print("2. Or run locally: uvicorn app.main:app --reload")
+    print("2. Or run locally: uvicorn --factory app.main:create_app --reload")
     print("3. Visit http://localhost:8000/docs for API documentation")
 
 if __name__ == "__main__":
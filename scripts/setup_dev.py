@@ -63,7 +63,7 @@ def setup_environment():
     print("\n🎉 Setup completed!")
     print("\nNext steps:")
     print("1. Edit .env file with your API keys and configuration")
-    print("2. Start the application: uvicorn app.main:app --reload")
+    print("2. Start the application: uvicorn --factory app.main:create_app --reload")
     print("3. Or use Docker Compose: docker-compose up")
     print("4. Visit http://localhost:8000/docs for API documentation")
 
@@ -0,0 +1,5 @@
+import os
+
+# TestClient runs each request on its own event loop and several tests use
+# asyncio.run, so pooled asyncpg connections would be reused across loops
+os.environ.setdefault("DB_NULL_POOL", "true")
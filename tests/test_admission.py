@@ -0,0 +1,92 @@
+import asyncio
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.utils.admission import AdmissionMiddleware, ConcurrencyLimiter, TokenBuckets, parse_rate_rules
+
+def make_buckets(rules: dict, max_clients: int = 1000) -> TokenBuckets:
+    return TokenBuckets(parse_rate_rules(rules), sweep_seconds=60, max_clients=max_clients)
+
+def test_longest_prefix_rule_wins():
+    buckets = make_buckets({"*": [5, 5], "GET /events/": [10, 10], "GET /events/export": [0, 0]})
+    assert buckets.rules[buckets.match("GET", "/events/")][1] == "/events/"
+    assert buckets.rules[buckets.match("POST", "/events/")][1] == ""
+    # A rate of 0 exempts the route
+    assert buckets.match("GET", "/events/export") is None
+
+def test_bucket_allows_burst_then_reports_wait():
+    buckets = make_buckets({"*": [1, 3]})
+    assert [buckets.take("GET", "/", "a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = buckets.take("GET", "/", "a")
+    assert 0 < wait <= 1
+    # Other clients have their own buckets
+    assert buckets.take("GET", "/", "b") == 0.0
+
+def test_bucket_refills_over_time():
+    buckets = make_buckets({"*": [1000, 1]})
+    assert buckets.take("GET", "/", "a") == 0.0
+    time.sleep(0.01)
+    assert buckets.take("GET", "/", "a") == 0.0
+
+def test_sweep_drops_refilled_buckets_and_caps_clients():
+    buckets = make_buckets({"*": [1, 2]}, max_clients=10)
+    buckets.take("GET", "/", "idle")
+    buckets.take("GET", "/", "busy")
+    buckets.take("GET", "/", "busy")
+    # One second later the idle bucket is full again; the busy one is not
+    assert buckets.sweep(time.monotonic() + 1) == 1
+    assert len(buckets) == 1
+
+    for client in range(20):
+        buckets.take("GET", "/", f"client-{client}")
+    assert len(buckets) <= 10
+
+def test_limiter_queues_briefly_then_sheds():
+    async def main():
+        limiter = ConcurrencyLimiter(limit=1, queue_size=1, queue_timeout=0.05)
+        assert await limiter.acquire()
+        # The queue is full once one request waits; the next one is shed at once
+        waiting = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not await limiter.acquire()
+        limiter.release()
+        assert await waiting
+        assert limiter.active == 1
+        # Nobody releases this time, so the waiter times out
+        assert not await limiter.acquire()
+        limiter.release()
+        assert limiter.active == 0
+
+    asyncio.run(main())
+
+def make_client(buckets: TokenBuckets, limiter: ConcurrencyLimiter) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, buckets=buckets, limiter=limiter)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/items")
+    async def items():
+        return []
+
+    return TestClient(app)
+
+def test_middleware_answers_429_with_retry_after():
+    client = make_client(make_buckets({"GET /items": [0.5, 2]}), ConcurrencyLimiter(10, 0, 0))
+    assert [client.get("/items").status_code for _ in range(2)] == [200, 200]
+    response = client.get("/items")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
+    # Exempt paths are never limited
+    assert client.get("/health").status_code == 200
+
+def test_middleware_sheds_with_503_when_saturated():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=0, queue_timeout=0)
+    limiter.active = 1
+    client = make_client(make_buckets({"*": [0, 0]}), limiter)
+    response = client.get("/items")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json() == {"detail": "Server is busy"}
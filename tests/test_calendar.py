@@ -0,0 +1,79 @@
+import asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from app.main import app
+from app.database import ReadSessionLocal, dispose_engines
+from app.models import Event
+from app.services.calendar_service import IcsSnapshotCache, ics_cache
+
+client = TestClient(app)
+
+def test_calendar_feed_is_streamed():
+    client.post("/events/", json={
+        "name": "Public Calendar Event",
+        "date": "2025-05-01T10:00:00",
+        "visibility": "public"
+    })
+    client.post("/events/", json={
+        "name": "Private Calendar Event",
+        "date": "2025-05-01T11:00:00",
+        "visibility": "private"
+    })
+
+    response = client.get("/calendar.ics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/calendar")
+    body = response.text
+    assert body.startswith("BEGIN:VCALENDAR")
+    assert body.endswith("END:VCALENDAR")
+    assert "SUMMARY:Public Calendar Event" in body
+    assert "SUMMARY:Private Calendar Event" not in body
+    assert body.count("BEGIN:VEVENT") == body.count("END:VEVENT")
+
+def test_calendar_feed_conditional_requests():
+    first = client.get("/calendar.ics")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    last_modified = first.headers["Last-Modified"]
+
+    assert client.get("/calendar.ics", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/calendar.ics", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+def test_calendar_feed_invalidated_on_create():
+    etag = client.get("/calendar.ics").headers["ETag"]
+    client.post("/events/", json={
+        "name": "Freshly Added Event",
+        "date": "2025-06-01T10:00:00",
+        "visibility": "public"
+    })
+
+    response = client.get("/calendar.ics", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "SUMMARY:Freshly Added Event" in response.text
+
+def test_unchanged_rerender_keeps_last_modified():
+    first = client.get("/calendar.ics")
+    # A re-render (TTL expiry or another worker's write) with the same content
+    ics_cache.invalidate()
+    second = client.get("/calendar.ics")
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.headers["Last-Modified"] == first.headers["Last-Modified"]
+
+def test_workers_agree_on_last_modified():
+    async def scenario():
+        try:
+            # Two workers' caches, rendered at different times
+            first = await IcsSnapshotCache(60).get()
+            await asyncio.sleep(1.1)
+            second = await IcsSnapshotCache(60).get()
+            async with ReadSessionLocal() as db:
+                latest = await db.scalar(select(func.max(Event.updated_at)))
+            return first, second, latest
+        finally:
+            await dispose_engines()
+
+    first, second, latest = asyncio.run(scenario())
+    assert first.etag == second.etag
+    assert first.last_modified == second.last_modified
+    assert first.last_modified.replace(tzinfo=None) == latest.replace(microsecond=0)
@@ -0,0 +1,36 @@
+import asyncio
+from app.config import settings
+from app import database
+
+def test_engine_profiles_differ():
+    dev = database.engine_options("dev")
+    prod = database.engine_options("prod")
+    assert dev["echo"] is True
+    assert prod["echo"] is False
+    assert prod["pool_size"] > dev["pool_size"]
+
+def test_engine_options_apply_overrides(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 3)
+    monkeypatch.setattr(settings, "db_echo", False)
+    options = database.engine_options("dev")
+    assert options["pool_size"] == 3
+    assert options["echo"] is False
+    assert options["max_overflow"] == database.ENGINE_PROFILES["dev"]["max_overflow"]
+
+def test_replica_engine_is_separate_pool(monkeypatch):
+    # Build the shared primary engine, if needed, before pooling is switched on below
+    primary = database.engine
+    monkeypatch.setattr(settings, "db_null_pool", False)
+    # A second database on the same server stands in for a replica
+    replica_url = settings.database_url.rsplit("/", 1)[0] + "/campus_events_replica"
+    replica = database.build_engine(replica_url, "replica")
+    try:
+        assert replica is not primary
+        assert replica.sync_engine.pool.role == "replica"
+        assert replica.url.database == "campus_events_replica"
+    finally:
+        asyncio.run(replica.dispose())
+
+def test_reads_use_primary_without_replica():
+    if settings.database_replica_url is None:
+        assert database.read_engine is database.engine
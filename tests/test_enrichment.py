@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from app.config import settings
+from app.services.enrichment_service import (
+    EnrichmentError, EnrichmentWorker, FakeEnrichmentClient, MemoryEnrichmentStore,
+    normalize_description, parse_enrichments,
+)
+
+class FlakyClient(FakeEnrichmentClient):
+    """Fails the first call, then behaves like the fake"""
+
+    async def enrich(self, descriptions):
+        if not self.calls:
+            self.calls.append(list(descriptions))
+            raise EnrichmentError("temporarily unavailable")
+        return await super().enrich(descriptions)
+
+def test_normalization_ignores_whitespace():
+    assert normalize_description("  Robotics\n\tworkshop  ") == "Robotics workshop"
+    assert normalize_description("   ") is None
+
+def test_duplicates_and_batches(monkeypatch):
+    monkeypatch.setattr(settings, "enrichment_batch_size", 10)
+    monkeypatch.setattr(settings, "enrichment_max_concurrency", 2)
+    store = MemoryEnrichmentStore()
+    client = FakeEnrichmentClient()
+    for index in range(45):
+        store.add(f"Robotics workshop number {index}. Bring a laptop.")
+        store.add(f"Robotics  workshop number {index}.   Bring a laptop.")  # Same text, reformatted
+
+    enriched = asyncio.run(EnrichmentWorker(store, client).drain())
+    assert enriched == 45
+    assert len(client.calls) == 5  # ceil(45 / 10), never one call per event
+    assert max(len(batch) for batch in client.calls) == 10
+    assert store.enriched["Robotics workshop number 0. Bring a laptop."].summary.startswith("Robotics")
+
+    # A re-import of identical text is served from the cache
+    store.add("Robotics workshop number 0. Bring a laptop.")
+    assert asyncio.run(EnrichmentWorker(store, client).drain()) == 0
+    assert len(client.calls) == 5
+
+def test_failed_batch_is_retried(monkeypatch):
+    monkeypatch.setattr(settings, "enrichment_retry_base_seconds", 0)
+    store = MemoryEnrichmentStore()
+    store.add("Career fair in the main hall.")
+    worker = EnrichmentWorker(store, FlakyClient())
+
+    assert asyncio.run(worker.run_once()) == 0
+    assert asyncio.run(worker.run_once()) == 1
+    assert not store.pending
+
+def test_malformed_reply_is_rejected():
+    assert parse_enrichments('{"results": [{"index": 0, "summary": "s", "tags": ["AI"]}]}', 1)[0].tags == ["ai"]
+    with pytest.raises(EnrichmentError):
+        parse_enrichments('{"results": []}', 1)
+    with pytest.raises(EnrichmentError):
+        parse_enrichments("not json", 1)
+
+def test_disabled_without_api_key():
+    worker = EnrichmentWorker(MemoryEnrichmentStore(), None)
+    worker.wake()
+    assert not worker.enabled
@@ -1,6 +1,19 @@
+import asyncio
+import csv
+import io
+import json
 import pytest
+from datetime import datetime, timedelta, timezone
 from fastapi.testclient import TestClient
 from app.main import app
+from app.database import AsyncSessionLocal
+from app.services.event_service import (
+    EVENT_LIST_ADAPTER,
+    ListingCache,
+    fetch_events_page_json,
+    get_events_page_service,
+)
+from app.utils.helpers import decode_cursor, encode_cursor
 
 client = TestClient(app)
 
@@ -41,3 +54,251 @@ def test_filter_events_by_time():
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
+
+def test_paginate_events_with_cursor(sample_event):
+    for _ in range(3):
+        client.post("/events/", json=sample_event)
+    
+    first = client.get("/events/?limit=2")
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    next_cursor = first.headers.get("X-Next-Cursor")
+    assert next_cursor
+    
+    second = client.get(f"/events/?limit=2&cursor={next_cursor}")
+    assert second.status_code == 200
+    first_ids = {event["id"] for event in first.json()}
+    assert all(event["id"] not in first_ids for event in second.json())
+
+def test_invalid_cursor_is_rejected():
+    response = client.get("/events/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+def test_aware_cursor_is_normalized_to_utc():
+    date, event_id = decode_cursor(encode_cursor(datetime(2025, 1, 1, 2, tzinfo=timezone(timedelta(hours=2))), 5))
+    assert (date, event_id) == (datetime(2025, 1, 1), 5)
+    response = client.get(f"/events/?cursor={encode_cursor(datetime(2025, 1, 1, tzinfo=timezone.utc), 1)}")
+    assert response.status_code == 200
+
+def test_limit_is_capped():
+    response = client.get("/events/?limit=100000")
+    assert response.status_code == 422
+
+def test_bulk_create_events_json_array(sample_event):
+    invalid_event = {"name": "", "date": "not-a-date"}
+    response = client.post("/events/bulk", json=[sample_event, invalid_event, sample_event])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 1
+    assert [entry["index"] for entry in data["results"]] == [0, 1, 2]
+    assert "id" in data["results"][0]
+    assert "error" in data["results"][1]
+
+def test_bulk_create_events_ndjson(sample_event):
+    body = "\n".join([json.dumps(sample_event), "{broken", json.dumps(sample_event)]) + "\n"
+    response = client.post(
+        "/events/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 1
+
+def test_bulk_create_events_rejects_non_array(sample_event):
+    response = client.post("/events/bulk", json=sample_event)
+    assert response.status_code == 400
+
+def test_listing_cache_lru_and_generation():
+    cache = ListingCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", b"1", cache.generation)
+    cache.set("b", b"2", cache.generation)
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3", cache.generation)  # Evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    stale_generation = cache.generation
+    cache.invalidate()
+    assert cache.get("a") is None
+    cache.set("d", b"4", stale_generation)  # Computed before the write; must not be stored
+    assert cache.get("d") is None
+
+def test_listing_cache_invalidated_on_create(sample_event):
+    url = "/events/?start_time=2031-07-01T00:00:00&end_time=2031-07-31T23:59:59"
+    before = client.get(url).json()
+    client.post("/events/", json={**sample_event, "date": "2031-07-15T12:00:00"})
+    after = client.get(url).json()
+    assert len(after) == len(before) + 1
+
+def test_listing_cache_stats():
+    client.get("/events/?visibility=public")
+    client.get("/events/?visibility=public")
+    response = client.get("/events/cache/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["hits"] >= 1
+    assert {"misses", "evictions", "entries"} <= stats.keys()
+
+def test_fast_read_path_matches_orm_path(sample_event):
+    client.post("/events/", json=sample_event)
+
+    async def read_both():
+        async with AsyncSessionLocal() as db:
+            events, orm_cursor = await get_events_page_service(db, 50)
+            body, fast_cursor = await fetch_events_page_json(db, 50)
+        return EVENT_LIST_ADAPTER.dump_python(events, mode="json"), orm_cursor, body, fast_cursor
+
+    orm_events, orm_cursor, body, fast_cursor = asyncio.run(read_both())
+    assert json.loads(body) == orm_events
+    assert fast_cursor == orm_cursor
+
+def test_search_events_ranks_matches(sample_event):
+    client.post("/events/", json={**sample_event, "name": "Quantum Robotics Workshop", "description": "Build robots"})
+    client.post("/events/", json={**sample_event, "name": "Poetry Night", "description": "Robotics-themed verses"})
+
+    response = client.get("/events/search?q=robotics")
+    assert response.status_code == 200
+    results = response.json()
+    names = [event["name"] for event in results]
+    assert "Quantum Robotics Workshop" in names
+    # Name matches are weighted above description matches
+    if "Poetry Night" in names:
+        assert names.index("Quantum Robotics Workshop") < names.index("Poetry Night")
+    assert all("rank" in event for event in results)
+
+def test_search_events_paginates(sample_event):
+    for _ in range(3):
+        client.post("/events/", json={**sample_event, "name": "Paginated Chess Meetup"})
+    first = client.get("/events/search?q=chess&limit=2")
+    assert first.status_code == 200
+    next_cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/events/search?q=chess&limit=2&cursor={next_cursor}")
+    first_ids = {event["id"] for event in first.json()}
+    assert all(event["id"] not in first_ids for event in second.json())
+
+def test_search_requires_query():
+    assert client.get("/events/search").status_code == 422
+
+def test_recurring_event_expands_within_window(sample_event):
+    recurring = {**sample_event, "name": "Weekly Club Meeting", "date": "2032-01-06T18:00:00", "rrule": "FREQ=WEEKLY"}
+    assert client.post("/events/", json=recurring).status_code == 200
+
+    response = client.get("/events/?start_time=2032-02-01T00:00:00&end_time=2032-02-29T23:59:59")
+    meetings = [event for event in response.json() if event["name"] == "Weekly Club Meeting"]
+    assert [event["date"] for event in meetings] == [
+        "2032-02-03T18:00:00", "2032-02-10T18:00:00", "2032-02-17T18:00:00", "2032-02-24T18:00:00",
+    ]
+
+    calendar = client.get("/calendar.ics").text
+    assert calendar.count("SUMMARY:Weekly Club Meeting") == 1
+    assert "RRULE:FREQ=WEEKLY" in calendar
+
+def test_invalid_rrule_is_rejected(sample_event):
+    response = client.post("/events/", json={**sample_event, "rrule": "FREQ=SOMETIMES"})
+    assert response.status_code == 422
+
+def test_stats_follow_inserts(sample_event):
+    window = "start_time=2033-03-01T00:00:00&end_time=2033-03-31T23:59:59"
+    before = client.get(f"/events/stats?bucket=month&visibility=private&{window}").json()
+    before_count = before[0]["count"] if before else 0
+
+    client.post("/events/", json={**sample_event, "date": "2033-03-07T10:00:00", "visibility": "private"})
+    client.post("/events/bulk", json=[
+        {**sample_event, "date": "2033-03-07T12:00:00", "visibility": "private"},
+        {**sample_event, "date": "2033-03-21T12:00:00", "visibility": "private"},
+    ])
+
+    monthly = client.get(f"/events/stats?bucket=month&visibility=private&{window}").json()
+    assert monthly == [{"bucket": "2033-03-01", "visibility": "private", "count": before_count + 3}]
+    daily = client.get(f"/events/stats?bucket=day&visibility=private&{window}").json()
+    assert {row["bucket"]: row["count"] for row in daily}["2033-03-07"] >= 2
+
+def test_stats_rejects_unknown_bucket():
+    assert client.get("/events/stats?bucket=year").status_code == 422
+
+def test_export_ndjson_matches_listing(sample_event):
+    # University-only, so no public recurring series from other tests expand into the window
+    for day in ("05", "06"):
+        client.post("/events/", json={
+            **sample_event, "name": "Export Fixture", "date": f"2034-04-{day}T09:00:00", "visibility": "university-only",
+        })
+    window = "start_time=2034-04-01T00:00:00&end_time=2034-04-30T23:59:59&visibility=university-only"
+
+    response = client.get(f"/events/export?format=ndjson&{window}", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    listed = client.get(f"/events/?{window}&limit=1000").json()
+    # Timestamps may differ in trailing fractional zeros, so compare the rest
+    fields = ("id", "name", "date", "description", "visibility", "location", "link", "jira_key", "rrule")
+    assert [{key: event[key] for key in fields} for event in exported] == [
+        {key: event[key] for key in fields} for event in listed
+    ]
+
+def test_export_csv_gzip(sample_event):
+    client.post("/events/", json={**sample_event, "name": "Export, \"quoted\"", "date": "2034-05-05T09:00:00"})
+    response = client.get(
+        "/events/export?format=csv&start_time=2034-05-01T00:00:00&end_time=2034-05-31T23:59:59",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    rows = list(csv.DictReader(io.StringIO(response.text)))  # httpx decodes the gzip body
+    assert rows[-1]["name"] == 'Export, "quoted"'
+    assert rows[-1]["visibility"] == "public"
+
+def test_export_honours_accept_encoding_q_values():
+    url = "/events/export?format=csv&start_time=2034-05-01T00:00:00&end_time=2034-05-31T23:59:59"
+    refused = client.get(url, headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert refused.status_code == 200
+    assert "content-encoding" not in refused.headers
+    assert refused.text.startswith("id,")
+    assert client.get(url, headers={"Accept-Encoding": "br;q=1.0, *;q=0.5"}).headers["content-encoding"] == "gzip"
+
+def test_export_rejects_bad_visibility():
+    assert client.get("/events/export?visibility=everyone").status_code == 400
+
+@pytest.mark.parametrize("path", ["/events/", "/events/search?q=club", "/events/stats"])
+def test_unknown_visibility_is_rejected(path):
+    separator = "&" if "?" in path else "?"
+    response = client.get(f"{path}{separator}visibility=bogus")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid visibility: bogus"
+
+def test_fields_narrow_listing(sample_event):
+    for day in ("10", "11", "12"):
+        client.post("/events/", json={
+            **sample_event, "name": "Sparse Fixture", "date": f"2035-06-{day}T09:00:00", "visibility": "university-only",
+        })
+    window = "start_time=2035-06-01T00:00:00&end_time=2035-06-30T23:59:59&visibility=university-only"
+
+    first = client.get(f"/events/?{window}&fields=name&limit=2")
+    assert first.status_code == 200
+    assert first.json() == [{"name": "Sparse Fixture"}] * 2
+    # Pagination still works although date and id were not requested
+    second = client.get(f"/events/?{window}&fields=name&limit=2&cursor={first.headers['X-Next-Cursor']}")
+    assert second.json() == [{"name": "Sparse Fixture"}]
+
+    full = client.get(f"/events/?{window}").json()
+    sparse = client.get(f"/events/?{window}&fields=date,id,name").json()
+    assert sparse == [{"id": e["id"], "name": e["name"], "date": e["date"]} for e in full]
+
+def test_fields_orm_path_matches_fast_path():
+    fields = ("id", "name")
+
+    async def read_both():
+        async with AsyncSessionLocal() as db:
+            events, _ = await get_events_page_service(db, 20, fields=fields)
+            body, _ = await fetch_events_page_json(db, 20, fields=fields)
+        return [event.model_dump(mode="json") for event in events], body
+
+    orm_events, body = asyncio.run(read_both())
+    assert json.loads(body) == orm_events
+    assert all(set(event) == {"id", "name"} for event in orm_events)
+
+def test_unknown_field_is_rejected():
+    response = client.get("/events/?fields=id,secret")
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
@@ -0,0 +1,86 @@
+import asyncio
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from app.main import app
+from app.database import AsyncSessionLocal
+from app.models import Event
+from app.services.idempotency_service import IdempotencyStore, idempotency_store
+
+client = TestClient(app)
+
+def new_event(name: str) -> dict:
+    return {"name": name, "date": "2030-04-01T10:00:00", "visibility": "private"}
+
+async def count_events(name: str) -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(Event).where(Event.name == name))
+
+def test_retry_replays_the_first_response():
+    name = f"Idempotent {uuid.uuid4().hex}"
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+
+    first = client.post("/events/", json=new_event(name), headers=headers)
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = client.post("/events/", json=new_event(name), headers=headers)
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+    # Another worker, or this one after the LRU evicted the key, replays from Postgres
+    idempotency_store._entries.clear()
+    stored = client.post("/events/", json=new_event(name), headers=headers)
+    assert stored.json() == first.json()
+    assert stored.headers["Idempotent-Replayed"] == "true"
+    assert asyncio.run(count_events(name)) == 1
+
+def test_key_reused_with_different_body_is_rejected():
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    assert client.post("/events/", json=new_event("First body"), headers=headers).status_code == 200
+    response = client.post("/events/", json=new_event("Second body"), headers=headers)
+    assert response.status_code == 422
+
+def test_concurrent_duplicates_share_one_execution():
+    store = IdempotencyStore(max_entries=10, ttl_seconds=60)
+    executions = []
+
+    async def execute(db, key, request_hash, handler):
+        executions.append(key)
+        await asyncio.sleep(0.05)
+        return {"id": len(executions)}, False
+
+    store._execute = execute
+
+    async def main():
+        return await asyncio.gather(*(store.run(None, "key", "hash", None) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert executions == ["key"]
+    assert [response for response, _ in results] == [{"id": 1}] * 5
+    assert [replayed for _, replayed in results].count(False) == 1
+
+def test_failed_request_lets_a_duplicate_retry():
+    store = IdempotencyStore(max_entries=10, ttl_seconds=60)
+    attempts = []
+
+    async def execute(db, key, request_hash, handler):
+        attempts.append(key)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError("database went away")
+        return {"id": 7}, False
+
+    store._execute = execute
+
+    async def main():
+        return await asyncio.gather(
+            store.run(None, "key", "hash", None),
+            store.run(None, "key", "hash", None),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(main())
+    assert isinstance(first, RuntimeError)
+    assert second == ({"id": 7}, False)
+    assert len(attempts) == 2
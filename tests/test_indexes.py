@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from app.database import engine
+from app.services.calendar_service import build_ics_query
+from app.services.event_service import apply_keyset, build_events_query
+
+SEED_ROWS = 1_000_000
+
+pytestmark = [pytest.mark.slow, pytest.mark.integration]
+
+SEED_SQL = text("""
+    INSERT INTO events (name, date, description, visibility, created_at, updated_at)
+    SELECT
+        'Seeded event ' || n,
+        now() - interval '2 years' + random() * interval '3 years',
+        NULL,
+        (ARRAY['PUBLIC', 'PRIVATE', 'UNIVERSITY_ONLY'])[1 + (n % 3)]::visibilityenum,
+        now(),
+        now()
+    FROM generate_series(1, :rows) AS n
+""")
+
+def to_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+async def explain_plans() -> dict:
+    now = datetime.utcnow()
+    # Built as the listing builds them, including its rrule IS NULL predicate
+    listing = apply_keyset(build_events_query(now, now + timedelta(days=7), "university-only"), None, 101)
+    next_page = apply_keyset(build_events_query(now, now + timedelta(days=7), "university-only"), (now, 0), 101)
+    upcoming_public = apply_keyset(build_events_query(now, None, "public"), None, 101)
+
+    plans = {}
+    async with engine.connect() as conn:
+        # Seed inside a transaction that is rolled back, leaving the database untouched
+        trans = await conn.begin()
+        try:
+            await conn.execute(SEED_SQL, {"rows": SEED_ROWS})
+            await conn.execute(text("ANALYZE events"))
+            for name, sql in (
+                ("listing", f"EXPLAIN {to_sql(listing)}"),
+                ("next_page", f"EXPLAIN {to_sql(next_page)}"),
+                ("upcoming_public", f"EXPLAIN {to_sql(upcoming_public)}"),
+                # The feed is read through a server-side cursor, so plan it as one
+                ("ics", f"EXPLAIN DECLARE ics_cursor CURSOR FOR {to_sql(build_ics_query())}"),
+            ):
+                result = await conn.execute(text(sql))
+                plans[name] = "\n".join(row[0] for row in result)
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+    return plans
+
+def test_filter_queries_use_index_scans():
+    plans = asyncio.run(explain_plans())
+    for name, plan in plans.items():
+        assert "Index" in plan, f"{name} query does not use an index:\n{plan}"
+        assert "Seq Scan on events" not in plan, f"{name} query scans the table:\n{plan}"
@@ -0,0 +1,137 @@
+import asyncio
+from datetime import datetime
+import httpx
+import pytest
+from sqlalchemy import text, update
+from app.config import settings
+from app.database import AsyncSessionLocal, dispose_engines, get_engine
+from app.models import SyncJob, SyncState
+from app.services import jira_service
+from app.services.sync_service import JiraSyncScheduler
+
+TOTAL_ISSUES = 45
+PAGE_SIZE = 10
+
+def make_issue(number: int) -> dict:
+    return {
+        "key": f"EV-{number}",
+        "fields": {"summary": f"Issue {number}", "description": ""},
+    }
+
+@pytest.fixture
+def mock_jira(monkeypatch):
+    monkeypatch.setattr(settings, "jira_page_size", PAGE_SIZE)
+    monkeypatch.setattr(settings, "jira_retry_backoff_seconds", 0)
+    # Independent of any JIRA_* values in a local .env
+    monkeypatch.setattr(jira_service, "JIRA_BASE_URL", "https://jira.example.com")
+    monkeypatch.setattr(jira_service, "JIRA_USER_EMAIL", "test@example.com")
+    monkeypatch.setattr(jira_service, "JIRA_API_TOKEN", "test-token")
+    calls = {"search": 0, "throttled": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/rest/api/3/search"):
+            calls["search"] += 1
+            start_at = int(request.url.params["startAt"])
+            # Throttle the second page once to exercise the retry path
+            if start_at == PAGE_SIZE and calls["throttled"] == 0:
+                calls["throttled"] += 1
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            issues = [make_issue(n) for n in range(start_at, min(start_at + PAGE_SIZE, TOTAL_ISSUES))]
+            return httpx.Response(200, json={
+                "startAt": start_at,
+                "maxResults": PAGE_SIZE,
+                "total": TOTAL_ISSUES,
+                "issues": issues,
+            })
+        if request.url.path.endswith("/rest/api/3/myself"):
+            return httpx.Response(200, json={"emailAddress": "test@example.com"})
+        return httpx.Response(404)
+
+    asyncio.run(jira_service.start_jira_client(httpx.MockTransport(handler)))
+    yield calls
+    asyncio.run(jira_service.close_jira_client())
+
+def test_fetch_jira_events_paginates(mock_jira):
+    issues = asyncio.run(jira_service.fetch_jira_events())
+    assert [issue["key"] for issue in issues] == [f"EV-{n}" for n in range(TOTAL_ISSUES)]
+    assert mock_jira["search"] == 5 + mock_jira["throttled"]
+
+def test_jira_connection_uses_shared_client(mock_jira):
+    result = asyncio.run(jira_service.test_jira_connection())
+    assert result["message"] == "Connection successful!"
+
+def test_build_jql_uses_watermark(monkeypatch):
+    monkeypatch.setattr(settings, "jira_timezone", "Europe/Berlin")
+    assert "updated >=" not in jira_service.build_jql()
+    jql = jira_service.build_jql(datetime(2025, 1, 15, 9, 30))
+    assert 'updated >= "2025/01/15 10:30"' in jql
+    # Offsets must stay stable while pages are fetched concurrently
+    assert jql.endswith("ORDER BY key ASC")
+
+def test_watermark_never_passes_the_fetch_start(monkeypatch):
+    async def fetch_jira_events(updated_since):
+        # Jira reports an update stamped after this sync began
+        return [{**make_issue(0), "fields": {**make_issue(0)["fields"], "updated": "2099-01-01T00:00:00.000+0000"}}]
+
+    monkeypatch.setattr(jira_service, "fetch_jira_events", fetch_jira_events)
+
+    async def scenario():
+        try:
+            async with AsyncSessionLocal() as db:
+                state = await db.get(SyncState, jira_service.JIRA_SYNC_STATE)
+                previous = state.watermark if state else None
+                before = datetime.utcnow()
+                await jira_service.sync_jira_events(db)
+                watermark = (await db.get(SyncState, jira_service.JIRA_SYNC_STATE)).watermark
+                await db.execute(
+                    update(SyncState).where(SyncState.name == jira_service.JIRA_SYNC_STATE).values(watermark=previous)
+                )
+                await db.commit()
+                return before, watermark
+        finally:
+            await dispose_engines()
+
+    before, watermark = asyncio.run(scenario())
+    assert before <= watermark <= datetime.utcnow()
+
+def test_issue_to_event_row():
+    issue = {
+        "key": "EV-7",
+        "fields": {
+            "summary": "Hack Night",
+            "customfield_10010": "2025-03-15T18:00:00.000+0100",
+            "description": {
+                "type": "doc",
+                "content": [
+                    {"type": "paragraph", "content": [{"type": "text", "text": "Bring snacks"}]},
+                ],
+            },
+        },
+    }
+    row = jira_service.issue_to_event_row(issue)
+    assert row["jira_key"] == "EV-7"
+    assert row["date"] == datetime(2025, 3, 15, 17, 0)
+    assert row["description"] == "Bring snacks"
+
+def test_sync_skips_while_another_worker_holds_the_lock(mock_jira):
+    async def scenario():
+        scheduler = JiraSyncScheduler()
+        try:
+            # Another worker's sync, simulated by holding the advisory lock elsewhere
+            async with get_engine().connect() as other:
+                await other.execute(text("SELECT pg_advisory_lock(hashtext('jira_sync'))"))
+                scheduled = await scheduler.run(trigger="scheduled")
+                job = await scheduler.trigger()
+                await asyncio.gather(*scheduler._jobs)
+                await other.execute(text("SELECT pg_advisory_unlock(hashtext('jira_sync'))"))
+            second = await scheduler.trigger()
+            await asyncio.gather(*scheduler._jobs)
+            async with AsyncSessionLocal() as db:
+                return scheduled, (await db.get(SyncJob, job.id)).status, (await db.get(SyncJob, second.id)).status
+        finally:
+            await dispose_engines()
+
+    scheduled, skipped, succeeded = asyncio.run(scenario())
+    assert scheduled is None  # Skipped scheduled rounds are not recorded
+    assert skipped == "skipped"
+    assert succeeded == "succeeded"
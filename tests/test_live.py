@@ -0,0 +1,42 @@
+import asyncio
+from app.services.live_service import EventBroadcaster, format_sse
+
+def test_messages_fan_out_by_visibility():
+    async def scenario():
+        broadcaster = EventBroadcaster(queue_size=10, buffer_size=10)
+        everyone, _ = broadcaster.subscribe()
+        public_only, _ = broadcaster.subscribe("public")
+        broadcaster.publish_local("1", {"op": "created", "visibility": "private"})
+        broadcaster.publish_local("2", {"op": "refresh"})
+        return everyone.queue.qsize(), public_only.queue.qsize()
+
+    assert asyncio.run(scenario()) == (2, 1)
+
+def test_slow_consumer_is_dropped():
+    async def scenario():
+        broadcaster = EventBroadcaster(queue_size=2, buffer_size=10)
+        slow, _ = broadcaster.subscribe()
+        for message_id in ("1", "2", "3"):
+            broadcaster.publish_local(message_id, {"op": "created"})
+        return slow.dropped, await slow.queue.get(), broadcaster.subscriber_count
+
+    dropped, sentinel, remaining = asyncio.run(scenario())
+    assert dropped
+    assert sentinel is None
+    assert remaining == 0
+
+def test_resume_from_last_event_id():
+    async def scenario():
+        broadcaster = EventBroadcaster(queue_size=10, buffer_size=3)
+        for message_id in ("1", "2", "3", "4"):
+            broadcaster.publish_local(message_id, {"op": "created"})
+        _, replay = broadcaster.subscribe(last_event_id="2")
+        _, expired = broadcaster.subscribe(last_event_id="1")
+        return replay, expired
+
+    replay, expired = asyncio.run(scenario())
+    assert [message_id for message_id, _ in replay] == ["3", "4"]
+    assert expired is None  # Evicted from the buffer, so the client must refetch
+
+def test_format_sse():
+    assert format_sse("7", "created", {"id": 1}) == 'id: 7\nevent: created\ndata: {"id":1}\n\n'
@@ -0,0 +1,35 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.utils.metrics import Histogram, Gauge, Registry
+
+client = TestClient(app)
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.register(Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.1, "/a")
+    histogram.observe(5.0, "/a")
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+def test_gauge_callback_is_read_at_scrape_time():
+    registry = Registry()
+    state = {"size": 1}
+    registry.register(Gauge("pool", "Pool", ("state",), lambda: {("size",): state["size"]}))
+    state["size"] = 5
+    assert 'pool{state="size"} 5' in registry.render()
+
+def test_metrics_endpoint_reports_routes():
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    assert "http_requests_in_flight" in body
+    assert "db_pool_connections" in body
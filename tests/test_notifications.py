@@ -0,0 +1,165 @@
+import asyncio
+import json
+import time
+import uuid
+import httpx
+import pytest
+from sqlalchemy import delete, select
+from app.config import settings
+from app.database import AsyncSessionLocal, dispose_engines
+from app.models import NotificationOutbox
+from app.services.notification_service import (
+    DeliveryError, MemorySpool, NotificationDispatcher, OutboxItem, PostgresOutboxSpool, SlackWebhookSender,
+    render_digest,
+)
+
+def event_payload(index: int) -> dict:
+    return {"id": index, "name": f"Event {index}", "date": "2026-01-01T10:00:00", "visibility": "public"}
+
+def make_dispatcher(handler):
+    sender = SlackWebhookSender("https://hooks.example/test", transport=httpx.MockTransport(handler))
+    return NotificationDispatcher(MemorySpool(), sender)
+
+def test_burst_is_sent_as_one_digest(monkeypatch):
+    monkeypatch.setattr(settings, "slack_min_interval_seconds", 0)
+    posted = []
+
+    def handler(request):
+        posted.append(json.loads(request.content)["text"])
+        return httpx.Response(200, text="ok")
+
+    async def scenario():
+        dispatcher = make_dispatcher(handler)
+        await dispatcher.enqueue(None, [event_payload(i) for i in range(3)])
+        sent = await dispatcher.drain()
+        await dispatcher.stop()
+        return sent, dispatcher.spool
+
+    sent, spool = asyncio.run(scenario())
+    assert sent == 3
+    assert len(posted) == 1
+    assert posted[0].startswith("3 new events")
+    assert not spool.pending
+
+def test_rate_limited_batch_is_retried(monkeypatch):
+    monkeypatch.setattr(settings, "slack_min_interval_seconds", 0)
+    monkeypatch.setattr(settings, "notification_retry_base_seconds", 0)
+    responses = [httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200, text="ok")]
+
+    async def scenario():
+        dispatcher = make_dispatcher(lambda request: responses.pop(0))
+        await dispatcher.enqueue(None, [event_payload(1)])
+        first = await dispatcher.drain()
+        second = await dispatcher.drain()
+        await dispatcher.stop()
+        return first, second, dispatcher.spool
+
+    first, second, spool = asyncio.run(scenario())
+    assert (first, second) == (0, 1)
+    assert spool.sent[0].attempts == 2
+
+def test_http_date_retry_after_falls_back_to_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "slack_min_interval_seconds", 0)
+    retry_after = "Wed, 21 Oct 2026 07:28:00 GMT"
+
+    async def scenario():
+        dispatcher = make_dispatcher(lambda request: httpx.Response(429, headers={"Retry-After": retry_after}))
+        await dispatcher.enqueue(None, [event_payload(1)])
+        sent = await dispatcher.drain()
+        await dispatcher.stop()
+        return sent, dispatcher.spool
+
+    sent, spool = asyncio.run(scenario())
+    assert sent == 0
+    # Rescheduled with the spool's own backoff instead of failing the batch
+    assert spool.due_at[1] > time.monotonic()
+
+def test_long_rate_limit_wait_is_not_slept_out():
+    async def scenario():
+        sender = SlackWebhookSender("https://hooks.example/test", transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text="ok")
+        ))
+        sender._next_slot = time.monotonic() + SlackWebhookSender.MAX_WAIT_SECONDS + 30
+        started = time.monotonic()
+        with pytest.raises(DeliveryError) as error:
+            await sender.send("hello")
+        await sender.close()
+        return time.monotonic() - started, error.value.retry_after
+
+    elapsed, retry_after = asyncio.run(scenario())
+    assert elapsed < 1
+    assert retry_after > SlackWebhookSender.MAX_WAIT_SECONDS
+    assert SlackWebhookSender.MAX_WAIT_SECONDS + SlackWebhookSender.TIMEOUT_SECONDS < PostgresOutboxSpool.LEASE_SECONDS
+
+def test_gives_up_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(settings, "slack_min_interval_seconds", 0)
+    monkeypatch.setattr(settings, "notification_retry_base_seconds", 0)
+    monkeypatch.setattr(settings, "notification_max_attempts", 2)
+
+    async def scenario():
+        dispatcher = make_dispatcher(lambda request: httpx.Response(500, text="boom"))
+        await dispatcher.enqueue(None, [event_payload(1)])
+        for _ in range(3):
+            await dispatcher.drain()
+        await dispatcher.stop()
+        return dispatcher.spool
+
+    spool = asyncio.run(scenario())
+    assert not spool.pending
+    assert len(spool.failed) == 1
+
+def test_disabled_without_webhook():
+    async def scenario():
+        dispatcher = NotificationDispatcher(MemorySpool(), None)
+        await dispatcher.enqueue(None, [event_payload(1)])
+        return dispatcher.spool.pending
+
+    assert asyncio.run(scenario()) == {}
+
+def test_digest_is_capped():
+    items = [OutboxItem(i, event_payload(i), 1) for i in range(25)]
+    message = render_digest(items)
+    assert message.startswith("25 new events")
+    assert message.endswith("…and 5 more")
+
+@pytest.mark.integration
+def test_postgres_spool_leases_and_requeues(monkeypatch):
+    monkeypatch.setattr(settings, "notification_retry_base_seconds", 0)
+    monkeypatch.setattr(settings, "notification_max_attempts", 2)
+    # A channel of its own, so rows from other tests or a running app are not claimed
+    spool = PostgresOutboxSpool(f"test-{uuid.uuid4().hex}")
+
+    async def statuses() -> dict:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(NotificationOutbox.id, NotificationOutbox.status)
+                .where(NotificationOutbox.channel == spool.channel)
+            )
+            return dict(result.all())
+
+    async def scenario():
+        try:
+            async with AsyncSessionLocal() as db:
+                await spool.enqueue(db, [event_payload(i) for i in range(3)])
+                await db.commit()
+            # Concurrent claims skip each other's locked rows
+            first, second = await asyncio.gather(spool.claim(2), spool.claim(2))
+            leased = await spool.claim(10)
+            await spool.complete(first)
+            await spool.retry(second, "boom", None)
+            retried = await spool.claim(10)
+            await spool.retry(retried, "boom again", None)
+            return first, second, leased, retried, await statuses()
+        finally:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(NotificationOutbox).where(NotificationOutbox.channel == spool.channel))
+                await db.commit()
+            await dispose_engines()
+
+    first, second, leased, retried, final = asyncio.run(scenario())
+    assert sorted(len(batch) for batch in (first, second)) == [1, 2]
+    assert not {item.id for item in first} & {item.id for item in second}
+    assert leased == []
+    assert [item.id for item in retried] == [item.id for item in second]
+    assert [item.attempts for item in retried] == [2] * len(second)
+    assert sorted(final.values()) == ["failed"] * len(second) + ["sent"] * len(first)
@@ -0,0 +1,77 @@
+import asyncio
+import re
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import engine
+from app.services.event_service import build_events_query
+from app.services.partition_service import (
+    add_months, archive_partitions, ensure_partitions, partition_month, partition_name
+)
+
+pytestmark = [pytest.mark.slow, pytest.mark.integration]
+
+SCANNED_PARTITION = re.compile(r"on (events_p\d{6}|events_default)\b")
+
+def to_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+async def scanned_partitions(query) -> set:
+    async with engine.connect() as conn:
+        result = await conn.execute(text(f"EXPLAIN {to_sql(query)}"))
+        plan = "\n".join(row[0] for row in result)
+    await engine.dispose()
+    return set(SCANNED_PARTITION.findall(plan))
+
+def test_partition_names_round_trip():
+    assert partition_name(date(2026, 3, 1)) == "events_p202603"
+    assert partition_month("events_p202603") == date(2026, 3, 1)
+    assert partition_month("events_default") is None
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+def test_listing_window_prunes_to_its_month():
+    month = add_months(date.today().replace(day=1), 1)
+    start = datetime(month.year, month.month, 2)
+    query = build_events_query(start, start + timedelta(days=7), "university-only")
+    assert asyncio.run(scanned_partitions(query)) == {partition_name(month)}
+
+def test_upcoming_listing_skips_past_months():
+    this_month = date.today().replace(day=1)
+    query = build_events_query(datetime.utcnow(), None, "public")
+    scanned = asyncio.run(scanned_partitions(query))
+    assert partition_name(this_month) in scanned
+    assert partition_name(add_months(this_month, -1)) not in scanned
+
+async def move_out_of_default() -> tuple:
+    month = add_months(date.today().replace(day=1), 40)
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            await conn.execute(
+                text("""
+                    INSERT INTO events (name, date, visibility, created_at, updated_at)
+                    VALUES ('Far future', :date, 'PRIVATE', now(), now())
+                """),
+                {"date": datetime(month.year, month.month, 15)},
+            )
+            before = await conn.scalar(text("SELECT tableoid::regclass::text FROM events WHERE name = 'Far future'"))
+            async with AsyncSession(bind=conn) as db:
+                created = await ensure_partitions(db, 40)
+                again = await ensure_partitions(db, 40)
+                archived = await archive_partitions(db, 0)
+            after = await conn.scalar(text("SELECT tableoid::regclass::text FROM events WHERE name = 'Far future'"))
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+    return month, before, after, created, again, archived
+
+def test_ensure_partitions_moves_rows_out_of_default():
+    month, before, after, created, again, archived = asyncio.run(move_out_of_default())
+    assert before == "events_default"
+    assert after == partition_name(month)
+    assert partition_name(month) in created
+    assert again == []
+    assert archived == []
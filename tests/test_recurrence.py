@@ -0,0 +1,56 @@
+import time
+from datetime import datetime
+import pytest
+from pydantic import ValidationError
+from app.models import EventCreate
+from app.utils.recurrence import MAX_OCCURRENCES, merge_occurrences, occurrence_dates, recurrence_end
+
+WEEKLY = "FREQ=WEEKLY;BYDAY=TU"
+
+def test_occurrences_stay_inside_window():
+    dates = list(occurrence_dates(WEEKLY, datetime(2025, 1, 7, 18), datetime(2025, 3, 1), datetime(2025, 3, 20)))
+    assert dates == [datetime(2025, 3, 4, 18), datetime(2025, 3, 11, 18), datetime(2025, 3, 18, 18)]
+
+def test_unbounded_series_expands_lazily():
+    # An endless daily series over a year-long window only yields what is consumed
+    occurrences = occurrence_dates("FREQ=DAILY", datetime(2000, 1, 1), None, datetime(2100, 1, 1))
+    assert next(occurrences) == datetime(2000, 1, 1)
+
+def test_recurrence_end():
+    assert recurrence_end("FREQ=WEEKLY;COUNT=3", datetime(2025, 1, 7, 18)) == datetime(2025, 1, 21, 18)
+    assert recurrence_end(WEEKLY, datetime(2025, 1, 7, 18)) is None
+    assert recurrence_end("FREQ=WEEKLY;UNTIL=20250301T000000", datetime(2025, 1, 7, 18)) == datetime(2025, 2, 25, 18)
+
+@pytest.mark.parametrize("rrule", [
+    f"FREQ=MINUTELY;COUNT={MAX_OCCURRENCES + 1}",
+    "FREQ=MINUTELY;COUNT=2000000",
+    "FREQ=SECONDLY;UNTIL=20990101T000000",
+])
+def test_oversized_series_is_rejected_quickly(rrule):
+    started = time.monotonic()
+    with pytest.raises(ValidationError, match="at most"):
+        EventCreate(name="Too often", date=datetime(2025, 1, 1), rrule=rrule)
+    assert time.monotonic() - started < 1
+
+def test_occurrence_limit_counts_from_the_event_date():
+    # Daily until 2030 is too long from 2000 but fine from 2029
+    rrule = "FREQ=DAILY;UNTIL=20300101T000000"
+    assert EventCreate(name="Daily", date=datetime(2029, 1, 1), rrule=rrule).rrule == rrule
+    with pytest.raises(ValidationError):
+        EventCreate(name="Daily", date=datetime(2000, 1, 1), rrule=rrule)
+
+def test_merge_occurrences_respects_keyset_and_limit():
+    singles = [{"id": 1, "date": datetime(2025, 1, 8), "rrule": None}]
+    series = [{"id": 2, "date": datetime(2025, 1, 7), "rrule": "FREQ=DAILY"}]
+    merged = merge_occurrences(
+        singles,
+        series,
+        key=lambda row: (row["date"], row["id"]),
+        rrule_of=lambda row: row["rrule"],
+        with_date=lambda row, date: {**row, "date": date},
+        window_start=datetime(2025, 1, 1),
+        window_end=datetime(2025, 12, 31),
+        after=(datetime(2025, 1, 7), 2),
+        limit=3,
+    )
+    assert [(row["id"], row["date"].day) for row in merged] == [(1, 8), (2, 8), (2, 9)]
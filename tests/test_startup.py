@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+from app.config import settings
+from app.main import create_app
+
+def run_python(code: str, **env) -> str:
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True,
+        env={**os.environ, **env},
+    )
+    return completed.stdout.strip()
+
+def test_import_has_no_side_effects():
+    output = run_python(
+        "import sys, app.main, app.database; "
+        "print(bool(app.database._engines), 'openai' in sys.modules, 'app.services.jira_service' in sys.modules, "
+        "'app' in vars(app.main))",
+        JIRA_URL="", OPENAI_API_KEY="",
+    )
+    # The factory entry point imports app.main without building an application
+    assert output == "False False False False"
+
+def test_module_app_is_built_on_first_access():
+    import app.main
+
+    assert app.main.app is app.main.app
+    assert "/health" in {route.path for route in app.main.app.routes}
+
+def test_jira_routes_only_when_configured(monkeypatch):
+    monkeypatch.setattr(settings, "jira_url", None)
+    paths = {route.path for route in create_app().routes}
+    assert "/health" in paths
+    assert not any(path.startswith("/jira") for path in paths)
+
+    monkeypatch.setattr(settings, "jira_url", "https://jira.example.com")
+    paths = {route.path for route in create_app().routes}
+    assert "/jira/sync" in paths